@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import csv
 import re
+from array import array
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # rapid fuzzy import removed; using built-in tools only
 
@@ -80,10 +81,14 @@ STATE_ABBREVS = {
 
 USPS_STATES = set(STATE_ABBREVS.values())
 
+# Upper-case USPS codes map to themselves and lower-case names map to codes,
+# so normalize_state resolves either form with one probe.
+_STATE_LOOKUP: Dict[str, str] = {**{code: code for code in USPS_STATES}, **STATE_ABBREVS}
+
 ZIP_RE = re.compile(r"^(?P<zip5>\d{5})(?:[- ]?(?P<zip4>\d{4}))?$")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AddressValidationResult:
     address: str
     city: str
@@ -94,45 +99,74 @@ class AddressValidationResult:
     reasons: Tuple[str, ...] = ()
 
 
+# ZIP5 -> city/state lookup, dictionary-encoded: each distinct city and state
+# name is stored once, and two compact arrays indexed by int(zip5) hold codes
+# into those name tables. Code 0 means "no entry".
+_ZIP_TABLE_SIZE = 100000
+
+
+def _load_zip_index() -> Tuple[array, array, Tuple[str, ...], Tuple[str, ...]]:
+    dataset_path = Path(__file__).parent / "data" / "zipcodes.csv"
+    city_codes = array("I", [0]) * _ZIP_TABLE_SIZE
+    state_codes = array("H", [0]) * _ZIP_TABLE_SIZE
+    city_names: Dict[str, int] = {"": 0}
+    state_names: Dict[str, int] = {"": 0}
+    with dataset_path.open("r", encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp)
+        header = [column.strip() for column in next(reader, [])]
+        columns = list(zip(*filter(None, reader)))
+    if columns:
+        zips = columns[header.index("zip")]
+        city_values = columns[header.index("city")]
+        state_values = columns[header.index("state")]
+        for zip_code, city, state in zip(zips, city_values, state_values):
+            zip_code = zip_code.strip()
+            if not zip_code.isdigit() or len(zip_code) > 5:
+                continue
+            idx = int(zip_code)
+            city_codes[idx] = city_names.setdefault(city.strip(), len(city_names))
+            state_codes[idx] = state_names.setdefault(state.strip(), len(state_names))
+    return city_codes, state_codes, tuple(city_names), tuple(state_names)
+
+
+_ZIP_CITY_CODES, _ZIP_STATE_CODES, _CITY_NAMES, _STATE_NAMES = _load_zip_index()
+
+
 @lru_cache(maxsize=1)
 def load_zip_db() -> Dict[str, Tuple[str, str]]:
-    dataset_path = Path(__file__).parent / "data" / "zipcodes.csv"
-    mapping: Dict[str, Tuple[str, str]] = {}
-    with dataset_path.open("r", encoding="utf-8") as fp:
-        reader = csv.DictReader(fp)
-        for row in reader:
-            mapping[row["zip"].strip()] = (row["city"].strip(), row["state"].strip())
-    return mapping
+    return {
+        f"{idx:05d}": (_CITY_NAMES[code], _STATE_NAMES[_ZIP_STATE_CODES[idx]])
+        for idx, code in enumerate(_ZIP_CITY_CODES)
+        if code
+    }
+
+
+@lru_cache(maxsize=8192)
+def _expand_token(token: str) -> str:
+    expanded = ABBREVIATIONS.get(token.lower().strip(",."))
+    return expanded if expanded is not None else token.title()
 
 
 def normalize_address(address: str) -> str:
-    parts = []
-    tokens = re.split(r"\s+", address.strip())
-    for token in tokens:
-        lower = token.lower().strip(",.")
-        if lower in ABBREVIATIONS:
-            parts.append(ABBREVIATIONS[lower])
-        else:
-            parts.append(token.title())
-    return " ".join(parts)
+    return " ".join(map(_expand_token, address.split()))
 
 
 def normalize_state(state: str) -> Tuple[str, Tuple[str, ...]]:
     state = state.strip()
-    reasons = []
-    if len(state) == 2 and state.upper() in USPS_STATES:
-        return state.upper(), tuple(reasons)
-    normalized = state.lower()
-    if normalized in STATE_ABBREVS:
-        reasons.append("state_name_converted")
-        return STATE_ABBREVS[normalized], tuple(reasons)
-    return state.upper(), tuple(["invalid_state"])
+    is_code = len(state) == 2
+    code = _STATE_LOOKUP.get(state.upper() if is_code else state.lower())
+    if code is None:
+        return state.upper(), ("invalid_state",)
+    return code, () if is_code else ("state_name_converted",)
 
 
 def normalize_zip(zip_code: str) -> Tuple[Optional[str], Optional[str], Tuple[str, ...]]:
     if not zip_code:
         return None, None, ("missing_zip",)
-    match = ZIP_RE.match(zip_code.strip())
+    zip_code = zip_code.strip()
+    if len(zip_code) == 5 and zip_code.isascii() and zip_code.isdigit():
+        return zip_code, None, ()
+    match = ZIP_RE.match(zip_code)
     if not match:
         return None, None, ("invalid_zip",)
     zip5 = match.group("zip5")
@@ -141,8 +175,13 @@ def normalize_zip(zip_code: str) -> Tuple[Optional[str], Optional[str], Tuple[st
 
 
 def infer_city_state_from_zip(zip5: str) -> Optional[Tuple[str, str]]:
-    zip_db = load_zip_db()
-    return zip_db.get(zip5)
+    # int() also accepts signs, padding, underscores and non-ASCII digits, so
+    # only plain ASCII digit strings may index the lookup tables.
+    if len(zip5) != 5 or not (zip5.isascii() and zip5.isdigit()):
+        return None
+    idx = int(zip5)
+    code = _ZIP_CITY_CODES[idx]
+    return (_CITY_NAMES[code], _STATE_NAMES[_ZIP_STATE_CODES[idx]]) if code else None
 
 
 def normalize_city(city: str) -> str:
@@ -155,6 +194,29 @@ def validate_and_normalize_address(
     state: Optional[str],
     zip_code: Optional[str],
 ) -> AddressValidationResult:
+    return _validate_and_normalize_impl(address or "", city or "", state or "", zip_code or "")
+
+
+def validate_and_normalize_addresses(
+    records: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]],
+) -> List[AddressValidationResult]:
+    """Validate ``(address, city, state, zip_code)`` records, once per distinct record."""
+    keys = [
+        (address or "", city or "", state or "", zip_code or "")
+        for address, city, state, zip_code in records
+    ]
+    results = {key: _validate_and_normalize_impl(*key) for key in dict.fromkeys(keys)}
+    return [results[key] for key in keys]
+
+
+@lru_cache(maxsize=65536)
+def _validate_and_normalize_impl(
+    address: str,
+    city: str,
+    state: str,
+    zip_code: str,
+) -> AddressValidationResult:
+    # Results are frozen, so cached instances can be shared between rows.
     reasons = []
     normalized_address = normalize_address(address)
     zip5, zip4, zip_reasons = normalize_zip(zip_code or "")
@@ -170,8 +232,9 @@ def validate_and_normalize_address(
         normalized_state = ""
         reasons.append("missing_state")
 
+    inferred = infer_city_state_from_zip(zip5) if zip5 else None
+
     if not normalized_city and zip5:
-        inferred = infer_city_state_from_zip(zip5)
         if inferred:
             normalized_city, inferred_state = inferred
             if not normalized_state:
@@ -183,15 +246,10 @@ def validate_and_normalize_address(
             reasons.append("zip_not_found")
     elif not normalized_city:
         reasons.append("missing_city")
-    else:
-        normalized_city = normalize_city(normalized_city)
 
-    if not normalized_state and zip5:
-        inferred = infer_city_state_from_zip(zip5)
-        if inferred:
-            _, inferred_state = inferred
-            normalized_state = inferred_state
-            reasons.append("inferred_state_from_zip")
+    if not normalized_state and inferred:
+        normalized_state = inferred[1]
+        reasons.append("inferred_state_from_zip")
     if not normalized_state:
         reasons.append("missing_state")
 
@@ -202,7 +260,7 @@ def validate_and_normalize_address(
         zip5=zip5 or "",
         zip4=zip4,
         inferred="inferred_city_state_from_zip" in reasons or "inferred_state_from_zip" in reasons,
-        reasons=tuple(sorted(set(r for r in reasons if r))),
+        reasons=tuple(dict.fromkeys(r for r in reasons if r)),
     )
 
 
@@ -210,6 +268,7 @@ __all__ = [
     "AddressValidationResult",
     "normalize_address",
     "validate_and_normalize_address",
+    "validate_and_normalize_addresses",
     "normalize_state",
     "normalize_zip",
     "infer_city_state_from_zip",
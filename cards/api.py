@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from typing import List
 
 from . import simple_pandas as pd
@@ -54,19 +55,36 @@ class UploadPayload(BaseModel):
     batch_label: str | None = None
 
 
+_processor: DataProcessor | None = None
+# DataProcessor appends to its history cache while processing, so requests share it one at a time.
+# The CLI and the UI write to the same database, so each request first reads the entries
+# committed since the previous one.
+_processor_lock = threading.Lock()
+
+
+def get_processor() -> DataProcessor:
+    global _processor
+    if _processor is None:
+        _processor = DataProcessor()
+    return _processor
+
+
 @app.on_event("startup")
 def startup_event() -> None:
     init_db()
+    get_processor()
 
 
 @app.post("/process")
 def process(payload: UploadPayload):
-    processor = DataProcessor()
     new_df = pd.DataFrame(payload.new_visits)
     re_df = pd.DataFrame(payload.reprints)
     new_mapping = HeaderMappingResult(mapping=payload.new_visit_mapping, missing=[], extras=[])
     re_mapping = HeaderMappingResult(mapping=payload.reprint_mapping, missing=[], extras=[])
-    report = processor.process(new_df, re_df, new_mapping, re_mapping, batch_label=payload.batch_label)
+    with _processor_lock:
+        processor = get_processor()
+        processor.refresh_history()
+        report = processor.process(new_df, re_df, new_mapping, re_mapping, batch_label=payload.batch_label)
     return {
         "summary": report.summary,
         "issues": report.issues,
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+from itertools import chain
 from pathlib import Path
 from typing import Optional
 
@@ -9,8 +9,9 @@ import typer
 
 from . import init_db
 from .config import get_settings
-from .db import session_scope
+from .db import iter_rows, session_scope
 from .processing import DataProcessor
+from .utils import json_dumps, json_loads
 
 app = typer.Typer(help="Card Printing Table CLI")
 
@@ -39,13 +40,18 @@ def import_list(
     init_db()
     processor = DataProcessor()
 
-    df = processor.read_input(path)
-    mapping = processor.map_headers(df, "new_visit" if list_type == "new-visits" else "reprint")
+    # The list is read and spilled chunk by chunk, so the whole file is never held at once.
+    frames = processor.read_input_chunks(path)
+    first = next(frames, None)
+    if first is None:
+        # A header-only file yields no chunks; its empty frame still carries the columns.
+        first = processor.read_input(path)
+    mapping = processor.map_headers(first, "new_visit" if list_type == "new-visits" else "reprint")
 
-    temp_path = settings.export_dir / f"pending_{list_type}.parquet"
-    df.to_parquet(temp_path, index=False)
+    temp_path = settings.export_dir / f"pending_{list_type}.pkl"
+    pd.to_pickle_chunks(chain([first], frames), temp_path)
     mapping_path = settings.export_dir / f"pending_{list_type}_mapping.json"
-    mapping_path.write_text(json.dumps(mapping.mapping), encoding="utf-8")
+    mapping_path.write_text(json_dumps(mapping.mapping), encoding="utf-8")
 
     typer.echo(f"Stored {list_type} data for later merge at {temp_path}")
 
@@ -53,23 +59,24 @@ def import_list(
 @app.command()
 def merge(
     batch_label: Optional[str] = typer.Option(None, help="Optional label for batch"),
+    workers: int = typer.Option(1, help="Processes used to normalise large lists"),
 ) -> None:
     """Merge previously imported new visits and reprints."""
     settings = get_settings()
     init_db()
-    processor = DataProcessor()
+    processor = DataProcessor(workers=workers)
 
-    new_path = settings.export_dir / "pending_new-visits.parquet"
-    reprint_path = settings.export_dir / "pending_reprints.parquet"
+    new_path = settings.export_dir / "pending_new-visits.pkl"
+    reprint_path = settings.export_dir / "pending_reprints.pkl"
 
     if not new_path.exists() or not reprint_path.exists():
         raise typer.BadParameter("Both new visits and reprints must be imported before merge.")
 
-    new_df = pd.read_parquet(new_path)
-    re_df = pd.read_parquet(reprint_path)
+    new_df = pd.read_pickle_chunks(new_path)
+    re_df = pd.read_pickle_chunks(reprint_path)
 
-    new_mapping_data = json.loads((settings.export_dir / "pending_new-visits_mapping.json").read_text("utf-8"))
-    re_mapping_data = json.loads((settings.export_dir / "pending_reprints_mapping.json").read_text("utf-8"))
+    new_mapping_data = json_loads((settings.export_dir / "pending_new-visits_mapping.json").read_bytes())
+    re_mapping_data = json_loads((settings.export_dir / "pending_reprints_mapping.json").read_bytes())
 
     from .header_mapping import HeaderMappingResult
 
@@ -78,17 +85,17 @@ def merge(
 
     report = processor.process(new_df, re_df, new_mapping, re_mapping, batch_label=batch_label)
 
-    typer.echo(json.dumps(report.summary, indent=2))
+    typer.echo(json_dumps(report.summary, indent=True))
     typer.echo("Duplicate reports:")
-    typer.echo(json.dumps(report.duplicate_reports, indent=2))
+    typer.echo(json_dumps(report.duplicate_reports, indent=True))
     typer.echo(f"Batch ID: {report.batch_id}")
 
     with open(settings.export_dir / "latest_report.json", "w", encoding="utf-8") as fp:
-        json.dump({
+        fp.write(json_dumps({
             "summary": report.summary,
             "issues": report.issues,
             "duplicates": report.duplicate_reports,
-        }, fp, indent=2)
+        }, indent=True))
 
     typer.echo("Merge complete. Use `cards export` to create CSV outputs.")
 
@@ -110,8 +117,8 @@ def export(
         batch = conn.execute("SELECT id FROM batches WHERE id = ?", (batch_id,)).fetchone()
         if not batch:
             raise typer.BadParameter(f"Batch {batch_id} not found")
-        rows = [dict(row) for row in conn.execute("SELECT * FROM entries WHERE batch_id = ?", (batch_id,)).fetchall()]
-    entries = [processor.from_entry_record(row) for row in rows]
+        cursor = conn.execute("SELECT * FROM entries WHERE batch_id = ?", (batch_id,))
+        entries = [processor.from_entry_record(dict(row)) for row in iter_rows(cursor)]
 
     stamps, combined = processor.export(entries, batch_id)
     typer.echo(f"Exports written to {stamps} and {combined}")
@@ -130,28 +137,28 @@ def history(
 
     with session_scope() as conn:
         params = []
-        query = "SELECT id, label, created_at FROM batches"
+        if clinic:
+            query = (
+                "SELECT b.id, b.label, b.created_at, COUNT(e.id) AS clinic_count FROM batches b"
+                " LEFT JOIN entries e ON e.batch_id = b.id"
+                " AND e.clinic_name = ?"
+            )
+            params.append(clinic)
+        else:
+            query = "SELECT b.id, b.label, b.created_at FROM batches b"
         if since:
-            query += " WHERE created_at >= ?"
+            query += " WHERE b.created_at >= ?"
             params.append(since)
-        query += " ORDER BY created_at DESC"
+        if clinic:
+            query += " GROUP BY b.id"
+        query += " ORDER BY b.created_at DESC"
         typer.echo("Batches:")
-        for row in conn.execute(query, params).fetchall():
+        for row in conn.execute(query, params):
             label = row["label"] or "No label"
             created = row["created_at"]
             typer.echo(f"- {row['id']}: {label} ({created[:10]})")
             if clinic:
-                entries = conn.execute(
-                    "SELECT normalized_payload_json FROM entries WHERE batch_id = ?",
-                    (row["id"],),
-                ).fetchall()
-                count = sum(
-                    1
-                    for entry_row in entries
-                    if json.loads(entry_row["normalized_payload_json"]).get("clinic_name") == clinic
-                )
-                typer.echo(f"  Entries for clinic {clinic}: {count}")
-
+                typer.echo(f"  Entries for clinic {clinic}: {row['clinic_count']}")
 
 if __name__ == "__main__":
     app()
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
-from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Settings:
     db_url: str = "sqlite:///./card_printing.db"
     timezone: str = "America/Los_Angeles"
@@ -15,11 +15,11 @@ class Settings:
 
     @classmethod
     def from_env(cls) -> "Settings":
-        db_url = os.getenv("CARDS_DB_URL", cls.db_url)
-        timezone = os.getenv("CARDS_TIMEZONE", cls.timezone)
-        default_export = Path("exports")
-        export_dir = Path(os.getenv("CARDS_EXPORT_DIR", str(default_export)))
-        fuzzy_threshold = float(os.getenv("CARDS_FUZZY_THRESHOLD", cls.fuzzy_threshold))
+        defaults = cls()
+        db_url = os.getenv("CARDS_DB_URL", defaults.db_url)
+        timezone = os.getenv("CARDS_TIMEZONE", defaults.timezone)
+        export_dir = Path(os.getenv("CARDS_EXPORT_DIR", str(defaults.export_dir)))
+        fuzzy_threshold = float(os.getenv("CARDS_FUZZY_THRESHOLD", defaults.fuzzy_threshold))
         settings = cls(
             db_url=db_url,
             timezone=timezone,
@@ -30,9 +30,20 @@ class Settings:
         return settings
 
 
-@lru_cache(maxsize=1)
+_SETTINGS: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
-    return Settings.from_env()
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = Settings.from_env()
+    return _SETTINGS
+
+
+def reset_settings() -> None:
+    """Drop the cached settings so the next call re-reads the environment."""
+    global _SETTINGS
+    _SETTINGS = None
 
 
-__all__ = ["Settings", "get_settings"]
+__all__ = ["Settings", "get_settings", "reset_settings"]
@@ -1,13 +1,44 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterator
 
 from .config import get_settings
 
-_connection_cache: dict[str, sqlite3.Connection] = {}
+# SQLite connections must not be shared between threads, so each thread keeps its own.
+_tls = threading.local()
+
+# Applied once when a connection is opened; cached connections keep them.
+# page_size only takes effect on a new database, so it must precede the switch to WAL.
+# foreign_keys makes SQLite enforce the schema's REFERENCES clauses, so writers insert a
+# batch before its entries, and entries before the duplicate matches between them.
+_CONNECTION_PRAGMAS = """
+PRAGMA page_size=8192;
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+PRAGMA foreign_keys=ON;
+"""
+
+# Normalised fields stored as their own entries columns instead of inside
+# normalized_payload_json, so reads and filters need no JSON decoding.
+ENTRY_SCALAR_COLUMNS = (
+    "name",
+    "clinic_name",
+    "address",
+    "city",
+    "state",
+    "zip",
+    "zip4",
+    "heally_link",
+    "heally_id",
+    "duplicate",
+)
 
 
 def get_database_path() -> Path:
@@ -19,14 +50,42 @@ def get_database_path() -> Path:
     raise ValueError("Only sqlite:/// URLs are supported in this lightweight build")
 
 
+def _thread_connections() -> dict[str, sqlite3.Connection]:
+    connections = getattr(_tls, "connections", None)
+    if connections is None:
+        connections = _tls.connections = {}
+    return connections
+
+
 def get_connection() -> sqlite3.Connection:
     db_path = str(get_database_path())
-    if db_path not in _connection_cache:
+    connections = _thread_connections()
+    conn = connections.get(db_path)
+    if conn is None:
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         conn = sqlite3.connect(db_path)
         conn.row_factory = sqlite3.Row
-        _connection_cache[db_path] = conn
-    return _connection_cache[db_path]
+        conn.executescript(_CONNECTION_PRAGMAS)
+        connections[db_path] = conn
+    return conn
+
+
+def close_connections() -> None:
+    """Close the connections opened by the current thread."""
+    connections = _thread_connections()
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+
+
+def iter_rows(cursor: sqlite3.Cursor, size: int = 1000) -> Iterator[sqlite3.Row]:
+    """Yield rows from ``cursor`` in ``fetchmany`` chunks instead of one big ``fetchall``."""
+    cursor.arraysize = size
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            return
+        yield from rows
 
 
 @contextmanager
@@ -40,6 +99,20 @@ def session_scope() -> Iterator[sqlite3.Connection]:
         raise
 
 
+def _migrate_entry_columns(conn: sqlite3.Connection) -> None:
+    """Add the scalar entry columns to databases created before they existed."""
+    existing = {row["name"] for row in conn.execute("PRAGMA table_info(entries)")}
+    missing = [column for column in ENTRY_SCALAR_COLUMNS if column not in existing]
+    if not missing:
+        return
+    for column in missing:
+        conn.execute(f"ALTER TABLE entries ADD COLUMN {column} TEXT")
+    assignments = ", ".join(
+        f"{column} = json_extract(normalized_payload_json, '$.{column}')" for column in missing
+    )
+    conn.execute(f"UPDATE entries SET {assignments}")
+
+
 def init_db() -> None:
     conn = get_connection()
     conn.execute(
@@ -64,10 +137,21 @@ def init_db() -> None:
             normalized_payload_json TEXT NOT NULL,
             validation_status TEXT NOT NULL,
             uncertainty_reasons TEXT NOT NULL,
+            name TEXT,
+            clinic_name TEXT,
+            address TEXT,
+            city TEXT,
+            state TEXT,
+            zip TEXT,
+            zip4 TEXT,
+            heally_link TEXT,
+            heally_id TEXT,
+            duplicate TEXT,
             FOREIGN KEY(batch_id) REFERENCES batches(id)
         )
         """
     )
+    _migrate_entry_columns(conn)
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS duplicate_matches (
@@ -76,7 +160,9 @@ def init_db() -> None:
             matched_entry_id INTEGER,
             rule TEXT NOT NULL,
             score REAL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(entry_id) REFERENCES entries(id),
+            FOREIGN KEY(matched_entry_id) REFERENCES entries(id)
         )
         """
     )
@@ -94,7 +180,21 @@ def init_db() -> None:
         )
         """
     )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_batch_id ON entries(batch_id)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_entries_batch_clinic ON entries(batch_id, clinic_name)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_dup_entry ON duplicate_matches(entry_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_dup_matched ON duplicate_matches(matched_entry_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_batches_created ON batches(created_at DESC)")
     conn.commit()
 
 
-__all__ = ["init_db", "session_scope", "get_connection"]
+__all__ = [
+    "ENTRY_SCALAR_COLUMNS",
+    "init_db",
+    "session_scope",
+    "get_connection",
+    "close_connections",
+    "iter_rows",
+]
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import difflib
 
+try:  # pragma: no cover - exercised when rapidfuzz is installed
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover
+    fuzz = process = None  # type: ignore[assignment]
+
 REQUIRED_FIELDS = {
     "new_visit": [
         "name",
@@ -46,6 +52,37 @@ CANONICAL_HEADERS = {
     "heally_id": ["heally_id", "patient_id", "id"],
 }
 
+_VARIANT_TO_CANONICAL: Dict[str, str] = {}
+for _canonical, _variants in CANONICAL_HEADERS.items():
+    for _variant in _variants:
+        _VARIANT_TO_CANONICAL.setdefault(_variant, _canonical)
+
+
+@lru_cache(maxsize=256)
+def _closest_headers(
+    canonicals: Tuple[str, ...], normalized: Tuple[str, ...]
+) -> Tuple[Tuple[str, int], ...]:
+    matches = []
+    for canonical in canonicals:
+        candidates: Sequence[str] = normalized
+        if process is not None:
+            # rapidfuzz's ratio over the longest common subsequence is never below
+            # difflib's, so this screen keeps every header difflib could accept and
+            # difflib still picks the match, with or without rapidfuzz.
+            hits = process.extract(
+                canonical,
+                normalized,
+                scorer=fuzz.ratio,
+                processor=None,
+                score_cutoff=85 - 1e-6,
+                limit=None,
+            )
+            candidates = [hit[0] for hit in hits]
+        closest = difflib.get_close_matches(canonical, candidates, n=1, cutoff=0.85)
+        if closest:
+            matches.append((canonical, normalized.index(closest[0])))
+    return tuple(matches)
+
 
 @dataclass
 class HeaderMappingResult:
@@ -60,18 +97,16 @@ class HeaderMapper:
         self.normalized = [h.lower().replace(" ", "_") for h in self.headers]
 
     def suggest_mapping(self) -> Dict[str, str]:
-        mapping: Dict[str, str] = {}
-        for canonical, variants in CANONICAL_HEADERS.items():
-            for header, normalized in zip(self.headers, self.normalized):
-                if normalized in variants:
-                    mapping[canonical] = header
-                    break
-            if canonical not in mapping:
-                closest = difflib.get_close_matches(canonical, self.normalized, n=1, cutoff=0.85)
-                if closest:
-                    idx = self.normalized.index(closest[0])
-                    mapping[canonical] = self.headers[idx]
-        return mapping
+        found: Dict[str, str] = {}
+        for header, normalized in zip(self.headers, self.normalized):
+            canonical = _VARIANT_TO_CANONICAL.get(normalized)
+            if canonical and canonical not in found:
+                found[canonical] = header
+        unresolved = tuple(c for c in CANONICAL_HEADERS if c not in found)
+        if unresolved:
+            for canonical, idx in _closest_headers(unresolved, tuple(self.normalized)):
+                found[canonical] = self.headers[idx]
+        return {canonical: found[canonical] for canonical in CANONICAL_HEADERS if canonical in found}
 
     def resolve(self, required_for: str) -> HeaderMappingResult:
         required = REQUIRED_FIELDS[required_for]
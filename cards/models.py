@@ -24,6 +24,16 @@ class Entry:
     normalized_payload_json: str
     validation_status: str
     uncertainty_reasons: str
+    name: Optional[str] = None
+    clinic_name: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip: Optional[str] = None
+    zip4: Optional[str] = None
+    heally_link: Optional[str] = None
+    heally_id: Optional[str] = None
+    duplicate: Optional[str] = None
 
 
 @dataclass
@@ -1,26 +1,45 @@
 from __future__ import annotations
 
-import json
+import csv
+import multiprocessing
+import multiprocessing.pool
+from bisect import bisect_left
 from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypedDict,
+)
 
 from . import simple_pandas as pd
 
-from .address import AddressValidationResult, validate_and_normalize_address
+from .address import validate_and_normalize_addresses
 from .config import get_settings
-from .db import session_scope, init_db
+from .db import ENTRY_SCALAR_COLUMNS, session_scope, init_db
 from .header_mapping import HeaderMappingResult, map_headers
 from .utils import (
     NormalizedEntry,
+    block_entries,
+    block_key,
     extract_heally,
+    first_fuzzy_match,
     format_datetime,
-    fuzzy_match_score,
+    json_dumps,
+    json_loads,
     normalize_name,
     normalized_key,
-    parse_datetime,
+    parse_datetimes_batch,
 )
 
 
@@ -36,34 +55,218 @@ class ProcessingReport:
 
 SUPPORTED_EXTENSIONS = {".csv", ".tsv", ".txt", ".xlsx"}
 
+STAMPS_HEADERS = ("Name", "Address", "City", "State", "Zip")
+COMBINED_HEADERS = (
+    "Name",
+    "Clinic Name",
+    "Address",
+    "City",
+    "State",
+    "Zip Code",
+    "Heally Link",
+    "Date and Time",
+    "List Source",
+    "Duplicate?",
+)
+EXPORT_BUFFER_SIZE = 1 << 20
+INPUT_CHUNK_ROWS = 50_000
+
+
+def _input_extension(path: Path) -> str:
+    ext = path.suffix.lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file extension: {ext}")
+    return ext
+
+
+# With workers enabled, frames of at least this many rows per worker are normalised
+# in the process pool; smaller ones are cheaper to handle inline than to ship out.
+PARALLEL_MIN_ROWS = 1000
+
+
+def _normalize_shard(task: Tuple[pd.DataFrame, Dict[str, str], str, str]) -> List[NormalizedEntry]:
+    return _normalize_frame(*task)
+
+
+def _normalize_frame(
+    df: pd.DataFrame,
+    mapping: Dict[str, str],
+    list_type: str,
+    timezone: str,
+) -> List[NormalizedEntry]:
+    normalized_entries: List[NormalizedEntry] = []
+    rows = []
+    address_inputs = []
+    date_inputs: List[Optional[str]] = []
+    name_field = mapping.get("name")
+    address_field = mapping.get("address")
+    city_field = mapping.get("city")
+    state_field = mapping.get("state")
+    zip_field = mapping.get("zip")
+    clinic_field = mapping.get("clinic_name")
+    date_field = mapping.get("date_time")
+    heally_field = mapping.get("heally_link")
+    for idx, row in df.iterrows():
+        raw = row
+        name = str(raw.get(name_field, "")) if name_field else ""
+        address = str(raw.get(address_field, "")) if address_field else ""
+        city = str(raw.get(city_field, "")) if city_field else ""
+        state = str(raw.get(state_field, "")) if state_field else ""
+        zip_code = str(raw.get(zip_field, "")) if zip_field else ""
+        clinic_name = str(raw.get(clinic_field, "")) if clinic_field else ""
+        date_value = raw.get(date_field) if date_field else None
+        heally_value = raw.get(heally_field) if heally_field else None
+        rows.append((raw, name, clinic_name, heally_value))
+        address_inputs.append((address, city, state, zip_code))
+        date_inputs.append(str(date_value) if date_value is not None else None)
+
+    address_results = validate_and_normalize_addresses(address_inputs)
+    date_results = parse_datetimes_batch(date_inputs, timezone)
+    list_source = "New Visit" if list_type == "new_visit" else "Reprint"
+
+    for (raw, name, clinic_name, heally_value), address_result, (date_time, date_reasons) in zip(
+        rows, address_results, date_results
+    ):
+        normalized_name, name_reasons = normalize_name(name)
+        heally_link, heally_id, heally_reasons = extract_heally(heally_value, raw)
+
+        reasons = []
+        reasons.extend(name_reasons)
+        reasons.extend(address_result.reasons)
+        reasons.extend(heally_reasons)
+        reasons.extend(date_reasons)
+
+        validation_status = "ok" if not reasons else "attention"
+        if not normalized_name or not address_result.address:
+            validation_status = "rejected"
+            reasons.append("missing_core_fields")
+
+        clinic = clinic_name.title() if clinic_name else ""
+        zip5 = address_result.zip5
+        zip4 = address_result.zip4
+        normalized = NormalizedEntry(
+            name=normalized_name,
+            clinic_name=clinic,
+            address=address_result.address,
+            city=address_result.city,
+            state=address_result.state,
+            zip_code=f"{zip5}-{zip4}" if zip5 and zip4 else zip4 or zip5,
+            heally_link=heally_link,
+            heally_id=heally_id,
+            date_time=date_time,
+            list_source=list_source,
+            raw=raw,
+            normalized_payload={
+                "name": normalized_name,
+                "clinic_name": clinic,
+                "address": address_result.address,
+                "city": address_result.city,
+                "state": address_result.state,
+                "zip": zip5,
+                "zip4": zip4,
+                "heally_link": heally_link,
+                "heally_id": heally_id,
+                "date_time": format_datetime(date_time),
+                "list_source": list_source,
+            },
+            validation_status=validation_status,
+            uncertainty_reasons=sorted(set(reasons)) if reasons else [],
+        )
+        normalized_entries.append(normalized)
+
+    return normalized_entries
+
+
+def _export_sort_key(entry: NormalizedEntry) -> Tuple[str, str]:
+    parts = entry.name.split()
+    if not parts:
+        return "", ""
+    return parts[0].lower(), parts[-1].lower()
+
+
+def _payload_from_record(record) -> Dict[str, Any]:
+    """Rebuild an entry's normalized payload from its scalar ``entries`` columns."""
+    payload: Dict[str, Any] = {column: record[column] for column in ENTRY_SCALAR_COLUMNS}
+    payload["date_time"] = record["date_time_local"] or ""
+    payload["list_source"] = record["list_source"]
+    if payload["duplicate"] is None:
+        del payload["duplicate"]
+    return payload
+
+
+class _HistoryItem(TypedDict):
+    """One cached entry, with its ``entries`` id once it has been stored."""
+
+    entry: NormalizedEntry
+    entry_id: Optional[int]
+
 
 class DataProcessor:
-    def __init__(self, timezone: Optional[str] = None):
+    def __init__(self, timezone: Optional[str] = None, workers: int = 1):
         self.settings = get_settings()
         if timezone:
             self.settings.timezone = timezone
+        # Processes used to normalise large frames. Only the CLI opts in: the API and the
+        # Streamlit app run inside threaded servers, where the default of 1 keeps it inline.
+        self.workers = workers
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+        self._pool_scoped = False
         init_db()
-        self.existing_entries_cache: List[Dict[str, object]] = []
+        self.existing_entries_cache: List[_HistoryItem] = []
+        # Lookup indexes over existing_entries_cache, maintained by _remember.
+        self._key_index: Dict[Tuple[str, str, str, str, str], _HistoryItem] = {}
+        self._heally_index: Dict[str, _HistoryItem] = {}
+        self._by_block: Dict[Tuple[str, str], List[_HistoryItem]] = defaultdict(list)
+        # Ids of the entries held in the cache, and the highest id read back from the
+        # database, so refresh_history only has to read rows committed since.
+        self._known_ids: Set[int] = set()
+        self._history_max_id = 0
+        self._load_history()
+
+    def _remember(
+        self,
+        entry: NormalizedEntry,
+        entry_id: Optional[int],
+        key: Optional[Tuple[str, str, str, str, str]] = None,
+    ) -> None:
+        item: _HistoryItem = {"entry": entry, "entry_id": entry_id}
+        self.existing_entries_cache.append(item)
+        self._key_index[key if key is not None else normalized_key(entry)] = item
+        if entry.heally_id:
+            self._heally_index.setdefault(entry.heally_id, item)
+        self._by_block[block_key(entry)].append(item)
+        if entry_id is not None:
+            self._known_ids.add(entry_id)
+
+    def refresh_history(self) -> None:
+        """Add entries committed by other writers since the history was last read."""
         self._load_history()
 
     def _load_history(self):
         with session_scope() as conn:
             cursor = conn.execute(
-                "SELECT id, list_source, normalized_payload_json, validation_status, uncertainty_reasons FROM entries"
+                "SELECT id, list_source, date_time_local, validation_status, uncertainty_reasons, "
+                + ", ".join(ENTRY_SCALAR_COLUMNS)
+                + " FROM entries WHERE id > ? ORDER BY id",
+                (self._history_max_id,),
             )
             rows = cursor.fetchall()
+            if rows:
+                self._history_max_id = rows[-1]["id"]
             for row in rows:
-                payload = json.loads(row["normalized_payload_json"])
-                reasons = json.loads(row["uncertainty_reasons"])
+                if row["id"] in self._known_ids:
+                    continue
+                payload = _payload_from_record(row)
+                reasons = json_loads(row["uncertainty_reasons"])
                 normalized = NormalizedEntry(
-                    name=payload.get("name", ""),
-                    clinic_name=payload.get("clinic_name", ""),
-                    address=payload.get("address", ""),
-                    city=payload.get("city", ""),
-                    state=payload.get("state", ""),
-                    zip_code=payload.get("zip", ""),
-                    heally_link=payload.get("heally_link", "N/A"),
-                    heally_id=payload.get("heally_id"),
+                    name=payload["name"] or "",
+                    clinic_name=payload["clinic_name"] or "",
+                    address=payload["address"] or "",
+                    city=payload["city"] or "",
+                    state=payload["state"] or "",
+                    zip_code=payload["zip"] or "",
+                    heally_link=payload["heally_link"] or "N/A",
+                    heally_id=payload["heally_id"],
                     date_time=None,
                     list_source=row["list_source"],
                     raw={},
@@ -71,15 +274,13 @@ class DataProcessor:
                     validation_status=row["validation_status"],
                     uncertainty_reasons=reasons,
                 )
-                self.existing_entries_cache.append({"entry": normalized, "entry_id": row["id"]})
+                self._remember(normalized, row["id"])
 
     def read_input(self, source) -> pd.DataFrame:
         if isinstance(source, pd.DataFrame):
             return source.copy()
         path = Path(source)
-        ext = path.suffix.lower()
-        if ext not in SUPPORTED_EXTENSIONS:
-            raise ValueError(f"Unsupported file extension: {ext}")
+        ext = _input_extension(path)
         if ext == ".xlsx":
             df = pd.read_excel(path)
         elif ext in {".tsv", ".txt"}:
@@ -88,18 +289,33 @@ class DataProcessor:
             df = pd.read_csv(path)
         return df
 
+    def read_input_chunks(
+        self, source, chunksize: int = INPUT_CHUNK_ROWS
+    ) -> Iterator[pd.DataFrame]:
+        """Like ``read_input`` but yields frames of at most ``chunksize`` rows."""
+        if isinstance(source, pd.DataFrame):
+            return (
+                source.iloc[start:start + chunksize] for start in range(0, len(source), chunksize)
+            )
+        path = Path(source)
+        ext = _input_extension(path)
+        if ext == ".xlsx":
+            return pd.read_excel(path, chunksize=chunksize)
+        if ext in {".tsv", ".txt"}:
+            return pd.read_csv(path, sep="\t", chunksize=chunksize)
+        return pd.read_csv(path, chunksize=chunksize)
+
     def map_headers(self, df: pd.DataFrame, list_type: str) -> HeaderMappingResult:
         result = map_headers(list(df.columns), list_type)
         return result
 
     def normalize_rows(
         self,
-        df: pd.DataFrame,
+        df: pd.DataFrame | Iterable[pd.DataFrame],
         list_type: str,
         header_mapping: HeaderMappingResult,
     ) -> Tuple[List[NormalizedEntry], Dict[str, List[str]]]:
         timezone = self.settings.timezone
-        normalized_entries: List[NormalizedEntry] = []
         issues: Dict[str, List[str]] = defaultdict(list)
 
         mapping = header_mapping.mapping
@@ -107,198 +323,195 @@ class DataProcessor:
         if missing:
             issues["missing_columns"] = missing
 
-        for idx, row in df.iterrows():
-            raw = row.to_dict()
-            name_field = mapping.get("name")
-            address_field = mapping.get("address")
-            city_field = mapping.get("city")
-            state_field = mapping.get("state")
-            zip_field = mapping.get("zip")
-            clinic_field = mapping.get("clinic_name")
-            date_field = mapping.get("date_time")
-            heally_field = mapping.get("heally_link")
-
-            name = str(raw.get(name_field, "")) if name_field else ""
-            address = str(raw.get(address_field, "")) if address_field else ""
-            city = str(raw.get(city_field, "")) if city_field else ""
-            state = str(raw.get(state_field, "")) if state_field else ""
-            zip_code = str(raw.get(zip_field, "")) if zip_field else ""
-            clinic_name = str(raw.get(clinic_field, "")) if clinic_field else ""
-            date_value = raw.get(date_field) if date_field else None
-            heally_value = raw.get(heally_field) if heally_field else None
-
-            normalized_name, name_reasons = normalize_name(name)
-            address_result: AddressValidationResult = validate_and_normalize_address(
-                address=address,
-                city=city,
-                state=state,
-                zip_code=zip_code,
-            )
-            heally_link, heally_id, heally_reasons = extract_heally(heally_value, raw)
-            date_time, date_reasons = parse_datetime(str(date_value) if date_value is not None else None, timezone)
-
-            reasons = []
-            reasons.extend(name_reasons)
-            reasons.extend(list(address_result.reasons))
-            reasons.extend(heally_reasons)
-            reasons.extend(date_reasons)
-
-            validation_status = "ok" if not reasons else "attention"
-            if not normalized_name or not address_result.address:
-                validation_status = "rejected"
-                reasons.append("missing_core_fields")
-
-            normalized = NormalizedEntry(
-                name=normalized_name,
-                clinic_name=clinic_name.title() if clinic_name else "",
-                address=address_result.address,
-                city=address_result.city,
-                state=address_result.state,
-                zip_code="-".join(filter(None, [address_result.zip5, address_result.zip4]))
-                if address_result.zip4
-                else address_result.zip5,
-                heally_link=heally_link,
-                heally_id=heally_id,
-                date_time=date_time,
-                list_source="New Visit" if list_type == "new_visit" else "Reprint",
-                raw=raw,
-                normalized_payload={
-                    "name": normalized_name,
-                    "clinic_name": clinic_name.title() if clinic_name else "",
-                    "address": address_result.address,
-                    "city": address_result.city,
-                    "state": address_result.state,
-                    "zip": address_result.zip5,
-                    "zip4": address_result.zip4,
-                    "heally_link": heally_link,
-                    "heally_id": heally_id,
-                    "date_time": format_datetime(date_time),
-                    "list_source": "New Visit" if list_type == "new_visit" else "Reprint",
-                },
-                validation_status=validation_status,
-                uncertainty_reasons=sorted(set(reasons)),
-            )
-            normalized_entries.append(normalized)
+        # Chunked input (see read_input_chunks) is normalised one frame at a time.
+        frames = [df] if isinstance(df, pd.DataFrame) else df
+        normalized_entries: List[NormalizedEntry] = []
+        with self._worker_pool():
+            for frame in frames:
+                normalized_entries.extend(
+                    self._normalize_chunk(frame, mapping, list_type, timezone)
+                )
 
         return normalized_entries, issues
 
-    def detect_duplicates(self, entries: List[NormalizedEntry]) -> List[Dict]:
-        duplicates = []
-        existing = {normalized_key(item["entry"]): item for item in self.existing_entries_cache}
-        for entry in entries:
-            key = normalized_key(entry)
-            if key in existing:
-                matched = existing[key]
-                duplicates.append(
-                    {
-                        "entry": entry,
-                        "rule": "exact_key",
-                        "score": 1.0,
-                        "matched": matched["entry"],
-                        "matched_entry_id": matched.get("entry_id"),
-                    }
-                )
+    @contextmanager
+    def _worker_pool(self) -> Iterator[None]:
+        """Share one worker pool, started on first use, across everything normalised inside."""
+        if self._pool_scoped:
+            yield
+            return
+        self._pool_scoped = True
+        try:
+            yield
+        finally:
+            self._pool_scoped = False
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+    def _normalize_chunk(
+        self,
+        df: pd.DataFrame,
+        mapping: Dict[str, str],
+        list_type: str,
+        timezone: str,
+    ) -> List[NormalizedEntry]:
+        workers = min(self.workers, len(df) // PARALLEL_MIN_ROWS)
+        if workers < 2:
+            return _normalize_frame(df, mapping, list_type, timezone)
+        if self._pool is None:
+            # Spawned workers do not inherit the parent's threads or the locks they hold.
+            self._pool = multiprocessing.get_context("spawn").Pool(processes=self.workers)
+        step = -(-len(df) // workers)
+        tasks = [
+            (df.iloc[start:start + step], mapping, list_type, timezone)
+            for start in range(0, len(df), step)
+        ]
+        shards = self._pool.map(_normalize_shard, tasks, chunksize=1)
+        return [entry for shard in shards for entry in shard]
+
+    def detect_duplicates(
+        self,
+        entries: List[NormalizedEntry],
+        keys: Optional[Sequence[Tuple[str, str, str, str, str]]] = None,
+    ) -> List[Dict]:
+        if keys is None:
+            keys = [normalized_key(entry) for entry in entries]
+        threshold = self.settings.fuzzy_threshold
+        reports: Dict[int, Dict] = {}
+        fuzzy_pending: List[NormalizedEntry] = []
+        for entry, key in zip(entries, keys):
+            matched = self._key_index.get(key)
+            if matched:
+                reports[id(entry)] = {
+                    "entry": entry,
+                    "rule": "exact_key",
+                    "score": 1.0,
+                    "matched": matched["entry"],
+                    "matched_entry_id": matched.get("entry_id"),
+                }
                 entry.normalized_payload["duplicate"] = "Yes"
                 continue
             if entry.heally_id:
-                for cached in self.existing_entries_cache:
-                    other = cached["entry"]
-                    if other.heally_id and other.heally_id == entry.heally_id:
-                        duplicates.append(
-                            {
-                                "entry": entry,
-                                "rule": "heally_id",
-                                "score": 1.0,
-                                "matched": other,
-                                "matched_entry_id": cached.get("entry_id"),
-                            }
-                        )
-                        entry.normalized_payload["duplicate"] = "Yes"
-                        break
-            if entry.normalized_payload.get("duplicate") == "Yes":
-                continue
-            for cached in self.existing_entries_cache:
-                other = cached["entry"]
-                score = fuzzy_match_score(entry, other)
-                if score >= self.settings.fuzzy_threshold:
-                    duplicates.append(
-                        {
-                            "entry": entry,
-                            "rule": "fuzzy",
-                            "score": score,
-                            "matched": other,
-                            "matched_entry_id": cached.get("entry_id"),
-                        }
-                    )
-                    entry.normalized_payload["duplicate"] = "Yes"
-                    break
-            if entry.normalized_payload.get("duplicate") != "Yes":
-                entry.normalized_payload["duplicate"] = "No"
-        return duplicates
-
-    def deduplicate_within_batch(self, entries: List[NormalizedEntry]) -> List[Dict]:
-        duplicates = []
-        seen_entries: List[NormalizedEntry] = []
-        for entry in entries:
-            duplicate_found = False
-            for other in seen_entries:
-                if normalized_key(entry) == normalized_key(other):
-                    duplicates.append({
+                cached = self._heally_index.get(entry.heally_id)
+                if cached:
+                    reports[id(entry)] = {
                         "entry": entry,
-                        "rule": "exact_key_batch",
+                        "rule": "heally_id",
                         "score": 1.0,
-                        "matched": other,
-                        "matched_entry_id": None,
-                    })
-                    duplicate_found = True
-                elif entry.heally_id and other.heally_id and entry.heally_id == other.heally_id:
-                    duplicates.append({
+                        "matched": cached["entry"],
+                        "matched_entry_id": cached.get("entry_id"),
+                    }
+                    entry.normalized_payload["duplicate"] = "Yes"
+            if entry.normalized_payload.get("duplicate") != "Yes":
+                fuzzy_pending.append(entry)
+
+        # Fuzzy matching only compares against history in the same state and ZIP3 block;
+        # each block's candidates are gathered once for all of its entries.
+        for block, members in block_entries(fuzzy_pending).items():
+            bucket = self._by_block.get(block, ())
+            candidates = [cached["entry"] for cached in bucket]
+            names = [candidate.name_lc for candidate in candidates]
+            for entry in members:
+                match = first_fuzzy_match(entry, candidates, threshold, names)
+                if match:
+                    index, score = match
+                    cached = bucket[index]
+                    reports[id(entry)] = {
                         "entry": entry,
-                        "rule": "heally_id_batch",
-                        "score": 1.0,
-                        "matched": other,
-                        "matched_entry_id": None,
-                    })
-                    duplicate_found = True
-                else:
-                    score = fuzzy_match_score(entry, other)
-                    if score >= self.settings.fuzzy_threshold:
-                        duplicates.append({
-                            "entry": entry,
-                            "rule": "fuzzy_batch",
-                            "score": score,
-                            "matched": other,
-                            "matched_entry_id": None,
-                        })
-                        duplicate_found = True
-                if duplicate_found:
+                        "rule": "fuzzy",
+                        "score": score,
+                        "matched": cached["entry"],
+                        "matched_entry_id": cached.get("entry_id"),
+                    }
                     entry.normalized_payload["duplicate"] = "Yes"
-                    other.normalized_payload["duplicate"] = "Yes"
-                    other.normalized_payload["list_source"] = "Both Lists"
-                    entry.normalized_payload["list_source"] = "Both Lists"
-                    other.list_source = "Both Lists"
-                    entry.list_source = "Both Lists"
-                    break
-            if not duplicate_found:
-                if entry.normalized_payload.get("duplicate") != "Yes":
+                else:
                     entry.normalized_payload["duplicate"] = "No"
-            seen_entries.append(entry)
+        return [reports[id(entry)] for entry in entries if id(entry) in reports]
+
+    def deduplicate_within_batch(
+        self,
+        entries: List[NormalizedEntry],
+        keys: Optional[Sequence[Tuple[str, str, str, str, str]]] = None,
+    ) -> List[Dict]:
+        if keys is None:
+            keys = [normalized_key(entry) for entry in entries]
+        duplicates = []
+        threshold = self.settings.fuzzy_threshold
+        # Earlier entries indexed by exact key and Heally ID, each paired with its
+        # position so the earliest match still wins. Each (state, ZIP3) block keeps
+        # its members' positions, entries and names as parallel lists in input order.
+        key_seen: Dict[Tuple[str, str, str, str, str], Tuple[int, NormalizedEntry]] = {}
+        heally_seen: Dict[str, Tuple[int, NormalizedEntry]] = {}
+        blocks: Dict[Tuple[str, str], Tuple[List[int], List[NormalizedEntry], List[str]]] = (
+            defaultdict(lambda: ([], [], []))
+        )
+        for position, (entry, key) in enumerate(zip(entries, keys)):
+            positions, members, names = blocks[block_key(entry)]
+            match = key_seen.get(key)
+            rule = "exact_key_batch"
+            score = 1.0
+            if entry.heally_id:
+                heally_match = heally_seen.get(entry.heally_id)
+                if heally_match and (match is None or heally_match[0] < match[0]):
+                    match = heally_match
+                    rule = "heally_id_batch"
+            # Fuzzy matching only needs the block members ahead of any hash match.
+            count = bisect_left(positions, match[0]) if match else len(positions)
+            if count:
+                if count < len(positions):
+                    hit = first_fuzzy_match(entry, members[:count], threshold, names[:count])
+                else:
+                    hit = first_fuzzy_match(entry, members, threshold, names)
+                if hit:
+                    index, score = hit
+                    match = (positions[index], members[index])
+                    rule = "fuzzy_batch"
+            if match:
+                other = match[1]
+                duplicates.append({
+                    "entry": entry,
+                    "rule": rule,
+                    "score": score,
+                    "matched": other,
+                    "matched_entry_id": None,
+                })
+                entry.normalized_payload["duplicate"] = "Yes"
+                other.normalized_payload["duplicate"] = "Yes"
+                other.normalized_payload["list_source"] = "Both Lists"
+                entry.normalized_payload["list_source"] = "Both Lists"
+                other.list_source = "Both Lists"
+                entry.list_source = "Both Lists"
+            elif entry.normalized_payload.get("duplicate") != "Yes":
+                entry.normalized_payload["duplicate"] = "No"
+            key_seen.setdefault(key, (position, entry))
+            if entry.heally_id:
+                heally_seen.setdefault(entry.heally_id, (position, entry))
+            positions.append(position)
+            members.append(entry)
+            names.append(entry.name_lc)
         return duplicates
 
     def process(
         self,
-        new_visit_df: pd.DataFrame,
-        reprint_df: pd.DataFrame,
+        new_visit_df: pd.DataFrame | Iterable[pd.DataFrame],
+        reprint_df: pd.DataFrame | Iterable[pd.DataFrame],
         new_visit_mapping: HeaderMappingResult,
         reprint_mapping: HeaderMappingResult,
         batch_label: Optional[str] = None,
     ) -> ProcessingReport:
-        new_entries, new_issues = self.normalize_rows(new_visit_df, "new_visit", new_visit_mapping)
-        re_entries, re_issues = self.normalize_rows(reprint_df, "reprint", reprint_mapping)
+        with self._worker_pool():
+            new_entries, new_issues = self.normalize_rows(
+                new_visit_df, "new_visit", new_visit_mapping
+            )
+            re_entries, re_issues = self.normalize_rows(reprint_df, "reprint", reprint_mapping)
 
         combined = new_entries + re_entries
-        cross_duplicates = self.detect_duplicates(combined)
-        batch_duplicates = self.deduplicate_within_batch(combined)
+        # Duplicate checks only read the keyed fields, so each key is computed once.
+        keys = [normalized_key(entry) for entry in combined]
+        cross_duplicates = self.detect_duplicates(combined, keys)
+        batch_duplicates = self.deduplicate_within_batch(combined, keys)
         duplicate_reports_raw = cross_duplicates + batch_duplicates
 
         for entry in combined:
@@ -317,54 +530,94 @@ class DataProcessor:
             issues.setdefault(key, []).extend(value)
 
         with session_scope() as conn:
+            # The first INSERT takes SQLite's write lock, so the batch is written in one transaction.
             cursor = conn.execute(
                 "INSERT INTO batches (label) VALUES (?)",
                 (batch_label,),
             )
             batch_id = cursor.lastrowid
-            entry_records: Dict[int, int] = {}
-            for entry in combined:
-                cursor = conn.execute(
-                    """
-                    INSERT INTO entries (
-                        batch_id,
-                        list_source,
-                        date_time_local,
-                        raw_payload_json,
-                        normalized_payload_json,
-                        validation_status,
-                        uncertainty_reasons
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
+            # normalized_payload_json is assembled by SQLite from the scalar columns.
+            conn.executemany(
+                """
+                INSERT INTO entries (
+                    batch_id,
+                    list_source,
+                    date_time_local,
+                    raw_payload_json,
+                    validation_status,
+                    uncertainty_reasons,
+                    name,
+                    clinic_name,
+                    address,
+                    city,
+                    state,
+                    zip,
+                    zip4,
+                    heally_link,
+                    heally_id,
+                    duplicate,
+                    normalized_payload_json
+                ) VALUES (
+                    ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, ?12, ?13, ?14, ?15, ?16,
+                    json_object(
+                        'name', ?7,
+                        'clinic_name', ?8,
+                        'address', ?9,
+                        'city', ?10,
+                        'state', ?11,
+                        'zip', ?12,
+                        'zip4', ?13,
+                        'heally_link', ?14,
+                        'heally_id', ?15,
+                        'date_time', ?17,
+                        'list_source', ?18,
+                        'duplicate', ?16
+                    )
+                )
+                """,
+                [
                     (
                         batch_id,
                         entry.list_source,
                         format_datetime(entry.date_time) if entry.date_time else None,
-                        json.dumps(entry.raw, default=str),
-                        json.dumps(entry.normalized_payload, default=str),
+                        json_dumps(entry.raw, default=str),
                         entry.validation_status,
-                        json.dumps(entry.uncertainty_reasons),
-                    ),
-                )
-                entry_records[id(entry)] = cursor.lastrowid
-
+                        json_dumps(entry.uncertainty_reasons),
+                        *(entry.normalized_payload.get(column) for column in ENTRY_SCALAR_COLUMNS),
+                        entry.normalized_payload.get("date_time"),
+                        entry.normalized_payload.get("list_source"),
+                    )
+                    for entry in combined
+                ],
+            )
+            # The batch is new, so its ids in ascending order follow the insertion order of combined.
+            entry_ids = [
+                row["id"]
+                for row in conn.execute("SELECT id FROM entries WHERE batch_id = ? ORDER BY id", (batch_id,))
+            ]
+            # combined keeps every entry alive, so their id()s are stable for this lookup.
+            entry_index: Dict[int, int] = {id(entry): index for index, entry in enumerate(combined)}
+
+            def stored_id(entry: Optional[NormalizedEntry]) -> Optional[int]:
+                index = entry_index.get(id(entry))
+                return entry_ids[index] if index is not None else None
+
+            duplicate_rows = []
             for duplicate in duplicate_reports_raw:
-                entry_obj = duplicate["entry"]
-                entry_id = entry_records.get(id(entry_obj))
+                entry_id = stored_id(duplicate["entry"])
                 matched_id = duplicate.get("matched_entry_id")
                 if not matched_id:
                     matched_entry = duplicate.get("matched")
                     if matched_entry:
-                        matched_id = entry_records.get(id(matched_entry))
-                conn.execute(
-                    "INSERT INTO duplicate_matches (entry_id, matched_entry_id, rule, score) VALUES (?, ?, ?, ?)",
-                    (entry_id, matched_id, duplicate["rule"], duplicate.get("score")),
-                )
+                        matched_id = stored_id(matched_entry)
+                duplicate_rows.append((entry_id, matched_id, duplicate["rule"], duplicate.get("score")))
+            conn.executemany(
+                "INSERT INTO duplicate_matches (entry_id, matched_entry_id, rule, score) VALUES (?, ?, ?, ?)",
+                duplicate_rows,
+            )
 
-        for entry in combined:
-            entry_id = entry_records.get(id(entry))
-            if entry_id:
-                self.existing_entries_cache.append({"entry": entry, "entry_id": entry_id})
+        for entry, entry_key, entry_id in zip(combined, keys, entry_ids):
+            self._remember(entry, entry_id, entry_key)
 
         return ProcessingReport(
             normalized_entries=combined,
@@ -389,46 +642,37 @@ class DataProcessor:
 
     def export(self, entries: List[NormalizedEntry], batch_id: int) -> Tuple[Path, Path]:
         settings = self.settings
-        entries_sorted = sorted(
-            entries,
-            key=lambda e: (
-                (e.name.split()[0].lower() if e.name else ""),
-                (e.name.split()[-1].lower() if e.name else ""),
-            ),
-        )
-
-        stamps_rows = [
-            {
-                "Name": entry.name,
-                "Address": entry.address,
-                "City": entry.city,
-                "State": entry.state,
-                "Zip": entry.zip_code,
-            }
-            for entry in entries_sorted
-        ]
-
-        combined_rows = [
-            {
-                "Name": entry.name,
-                "Clinic Name": entry.clinic_name,
-                "Address": entry.address,
-                "City": entry.city,
-                "State": entry.state,
-                "Zip Code": entry.zip_code,
-                "Heally Link": entry.heally_link,
-                "Date and Time": format_datetime(entry.date_time),
-                "List Source": entry.list_source,
-                "Duplicate?": entry.normalized_payload.get("duplicate", "No"),
-            }
-            for entry in entries_sorted
-        ]
+        entries_sorted = sorted(entries, key=_export_sort_key)
 
         stamps_path = settings.export_dir / f"stamps_batch_{batch_id}.csv"
         combined_path = settings.export_dir / f"combined_batch_{batch_id}.csv"
 
-        pd.DataFrame(stamps_rows).to_csv(stamps_path, index=False)
-        pd.DataFrame(combined_rows).to_csv(combined_path, index=False)
+        with open(stamps_path, "w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as fh:
+            writer = csv.writer(fh)
+            writer.writerow(STAMPS_HEADERS)
+            writer.writerows(
+                (entry.name, entry.address, entry.city, entry.state, entry.zip_code)
+                for entry in entries_sorted
+            )
+
+        with open(combined_path, "w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as fh:
+            writer = csv.writer(fh)
+            writer.writerow(COMBINED_HEADERS)
+            writer.writerows(
+                (
+                    entry.name,
+                    entry.clinic_name,
+                    entry.address,
+                    entry.city,
+                    entry.state,
+                    entry.zip_code,
+                    entry.heally_link,
+                    format_datetime(entry.date_time),
+                    entry.list_source,
+                    entry.normalized_payload.get("duplicate", "No"),
+                )
+                for entry in entries_sorted
+            )
 
         with session_scope() as conn:
             now = datetime.utcnow().isoformat()
@@ -456,27 +700,28 @@ class DataProcessor:
         return stamps_path, combined_path
 
     def from_entry_record(self, entry_row: Dict[str, str]) -> NormalizedEntry:
-        payload = json.loads(entry_row["normalized_payload_json"])
-        raw_payload = json.loads(entry_row["raw_payload_json"])
+        payload = _payload_from_record(entry_row)
+        raw_payload = json_loads(entry_row["raw_payload_json"])
         date_value = entry_row.get("date_time_local")
         date_time = datetime.fromisoformat(date_value) if date_value else None
+        name = payload["name"]
         normalized = NormalizedEntry(
-            name=payload.get("name", raw_payload.get("name", "")),
-            clinic_name=payload.get("clinic_name", ""),
-            address=payload.get("address", ""),
-            city=payload.get("city", ""),
-            state=payload.get("state", ""),
-            zip_code="-".join(filter(None, [payload.get("zip"), payload.get("zip4")]))
-            if payload.get("zip4")
-            else payload.get("zip", ""),
-            heally_link=payload.get("heally_link", "N/A"),
-            heally_id=payload.get("heally_id"),
+            name=name if name is not None else raw_payload.get("name", ""),
+            clinic_name=payload["clinic_name"] or "",
+            address=payload["address"] or "",
+            city=payload["city"] or "",
+            state=payload["state"] or "",
+            zip_code="-".join(filter(None, [payload["zip"], payload["zip4"]]))
+            if payload["zip4"]
+            else payload["zip"] or "",
+            heally_link=payload["heally_link"] or "N/A",
+            heally_id=payload["heally_id"],
             date_time=date_time,
             list_source=entry_row.get("list_source", ""),
             raw=raw_payload,
             normalized_payload=payload,
             validation_status=entry_row.get("validation_status", "ok"),
-            uncertainty_reasons=json.loads(entry_row.get("uncertainty_reasons", "[]")),
+            uncertainty_reasons=json_loads(entry_row.get("uncertainty_reasons", "[]")),
         )
         return normalized
 
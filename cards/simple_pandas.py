@@ -3,9 +3,11 @@ from __future__ import annotations
 import csv
 import io
 import json
+import pickle
 import zipfile
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 from xml.etree import ElementTree as ET
 
 __all__ = [
@@ -13,6 +15,9 @@ __all__ = [
     "read_csv",
     "read_excel",
     "read_parquet",
+    "read_pickle",
+    "read_pickle_chunks",
+    "to_pickle_chunks",
 ]
 
 
@@ -21,62 +26,106 @@ class Row(dict):
         return dict(self)
 
 
+# Marks a cell that was absent from its source row, so rebuilt rows omit the key.
+_MISSING: Any = object()
+
+
+def _cell(value: Any) -> Any:
+    return None if value is _MISSING else value
+
+
 class _ILoc:
     def __init__(self, df: "DataFrame") -> None:
         self.df = df
 
     def __getitem__(self, item):
+        cols = self.df._cols
         if isinstance(item, slice):
-            rows = self.df._rows[item]
-            return DataFrame([row.copy() for row in rows], columns=self.df.columns)
+            start, stop, step = item.indices(len(self.df))
+            length = len(range(start, stop, step))
+            return DataFrame._from_columns(
+                {name: values[item] for name, values in cols.items()}, length
+            )
         if isinstance(item, list):
-            rows = [self.df._rows[i] for i in item]
-            return DataFrame([row.copy() for row in rows], columns=self.df.columns)
-        return self.df._rows[item]
+            return DataFrame._from_columns(
+                {name: [values[i] for i in item] for name, values in cols.items()},
+                len(item),
+            )
+        return self.df._row(item)
 
 
 class DataFrame:
+    """Minimal column-oriented stand-in for ``pandas.DataFrame``.
+
+    Data is held as one list per column; rows are only materialised as dicts
+    when iterated.
+    """
+
     def __init__(self, data: Optional[Any] = None, columns: Optional[List[str]] = None):
-        self._rows: List[Dict[str, Any]] = []
+        self._cols: Dict[str, List[Any]] = {}
+        self._length = 0
         if data is None:
-            self._columns = columns or []
+            for name in columns or []:
+                self._cols[name] = []
             return
         if isinstance(data, list):
             for row in data:
                 if not isinstance(row, dict):
                     raise TypeError("Rows must be dictionaries")
-                self._rows.append(dict(row))
-            self._columns = list(columns or (list(data[0].keys()) if data else []))
-            if not self._columns and data:
-                self._columns = list(data[0].keys())
+            names = dict.fromkeys(columns or [])
+            for row in data:
+                names.update(dict.fromkeys(row))
+            self._cols = {name: [row.get(name, _MISSING) for row in data] for name in names}
+            self._length = len(data)
         elif isinstance(data, dict):
-            keys = list(data.keys())
             length = len(next(iter(data.values()))) if data else 0
             for key, values in data.items():
                 if len(values) != length:
                     raise ValueError("All columns must be the same length")
-            for idx in range(length):
-                self._rows.append({key: data[key][idx] for key in keys})
-            self._columns = columns or keys
+            names = dict.fromkeys(columns or [])
+            names.update(dict.fromkeys(data))
+            self._cols = {
+                name: list(data[name]) if name in data else [_MISSING] * length
+                for name in names
+            }
+            self._length = length
         else:
             raise TypeError("Unsupported data type for DataFrame")
 
+    @classmethod
+    def _from_columns(cls, cols: Dict[str, List[Any]], length: int) -> "DataFrame":
+        df = cls()
+        df._cols = cols
+        df._length = length
+        return df
+
+    def _row(self, idx: int) -> Row:
+        return Row({
+            name: values[idx]
+            for name, values in self._cols.items()
+            if values[idx] is not _MISSING
+        })
+
+    def _iter_row_dicts(self) -> Iterator[Row]:
+        names = list(self._cols)
+        if not names:
+            for _ in range(self._length):
+                yield Row()
+            return
+        for cells in zip(*self._cols.values()):
+            yield Row({name: value for name, value in zip(names, cells) if value is not _MISSING})
+
     @property
     def columns(self) -> List[str]:
-        if hasattr(self, "_columns") and self._columns:
-            return list(self._columns)
-        if self._rows:
-            self._columns = list(self._rows[0].keys())
-        else:
-            self._columns = []
-        return list(self._columns)
+        return list(self._cols)
 
     def iterrows(self) -> Iterator[tuple[int, Row]]:
-        for idx, row in enumerate(self._rows):
-            yield idx, Row(row)
+        return enumerate(self._iter_row_dicts())
 
     def copy(self) -> "DataFrame":
-        return DataFrame([row.copy() for row in self._rows], columns=self.columns)
+        return DataFrame._from_columns(
+            {name: list(values) for name, values in self._cols.items()}, self._length
+        )
 
     def to_csv(self, path: Path | str | io.IOBase, index: bool = False) -> None:
         close = False
@@ -85,39 +134,73 @@ class DataFrame:
             close = True
         else:
             fh = path
-        writer = csv.DictWriter(fh, fieldnames=self.columns)
-        writer.writeheader()
-        for row in self._rows:
-            writer.writerow({col: row.get(col, "") for col in self.columns})
+        writer = csv.writer(fh)
+        writer.writerow(self.columns)
+        columns = [
+            ["" if value is _MISSING else value for value in values]
+            for values in self._cols.values()
+        ]
+        if columns:
+            writer.writerows(zip(*columns))
+        else:
+            writer.writerows([] for _ in range(self._length))
         if close:
             fh.close()
 
-    def to_parquet(self, path: Path | str, index: bool = False) -> None:
-        data = {
+    def _to_serializable(self) -> Dict[str, Any]:
+        return {
             "columns": self.columns,
-            "rows": [[row.get(col) for col in self.columns] for row in self._rows],
+            "rows": (
+                [list(map(_cell, cells)) for cells in zip(*self._cols.values())]
+                if self._cols
+                else []
+            ),
         }
+
+    def to_parquet(self, path: Path | str, index: bool = False) -> None:
         with open(path, "w", encoding="utf-8") as fp:
-            json.dump(data, fp)
+            json.dump(self._to_serializable(), fp)
+
+    def to_pickle(self, path: Path | str) -> None:
+        with open(path, "wb") as fp:
+            pickle.dump(self._to_serializable(), fp, protocol=5)
 
     @property
     def iloc(self) -> _ILoc:
         return _ILoc(self)
 
     def __len__(self) -> int:
-        return len(self._rows)
+        return self._length
 
     def __getitem__(self, key: str) -> List[Any]:
-        return [row.get(key) for row in self._rows]
+        values = self._cols.get(key)
+        if values is None:
+            return [None] * self._length
+        return list(map(_cell, values))
 
     def append(self, row: Dict[str, Any]) -> None:
-        self._rows.append(dict(row))
+        for name in row:
+            if name not in self._cols:
+                self._cols[name] = [_MISSING] * self._length
+        for name, values in self._cols.items():
+            values.append(row.get(name, _MISSING))
+        self._length += 1
 
     def to_records(self) -> List[Dict[str, Any]]:
-        return [row.copy() for row in self._rows]
+        return [row.to_dict() for row in self._iter_row_dicts()]
 
     def __iter__(self):
-        return iter(self._rows)
+        return self._iter_row_dicts()
+
+
+def _from_serialized(data: Dict[str, Any]) -> DataFrame:
+    columns = data.get("columns", [])
+    rows = data.get("rows", [])
+    if not rows:
+        return DataFrame(columns=columns)
+    return DataFrame._from_columns(
+        {name: list(values) for name, values in zip(columns, zip(*rows))}, len(rows)
+    )
 
 
 def _ensure_text(data: bytes | str) -> str:
@@ -126,64 +209,193 @@ def _ensure_text(data: bytes | str) -> str:
     return data
 
 
-def read_csv(source, sep: str = ",") -> DataFrame:
+def _columns_from_records(header: List[str], records: List[List[str]]) -> DataFrame:
+    # Matches csv.DictReader: duplicate header names keep the last value and
+    # short records leave the trailing fields as None. _iter_csv_records
+    # rejects records longer than the header, so no cell is ever dropped here.
+    positions = {name: idx for idx, name in enumerate(header)}
+    width = len(header)
+    if all(len(record) == width for record in records):
+        transposed = list(zip(*records)) if records else [()] * width
+        cols = {name: list(transposed[idx]) for name, idx in positions.items()}
+    else:
+        cols = {
+            name: [record[idx] if idx < len(record) else None for record in records]
+            for name, idx in positions.items()
+        }
+    return DataFrame._from_columns(cols, len(records))
+
+
+def _iter_chunks(
+    header: List[str],
+    records: Iterator[List[str]],
+    chunksize: int,
+    build: Callable[[List[str], List[List[str]]], DataFrame],
+) -> Iterator[DataFrame]:
+    while True:
+        chunk = list(islice(records, chunksize))
+        if not chunk:
+            return
+        yield build(header, chunk)
+
+
+def _check_chunksize(chunksize: Optional[int]) -> None:
+    if chunksize is not None and chunksize < 1:
+        raise ValueError("chunksize must be a positive integer")
+
+
+def _iter_csv_records(source, sep: str) -> Iterator[List[str]]:
+    """Yield the header row and then every non-blank record of a CSV source."""
     if hasattr(source, "read"):
         content = _ensure_text(source.read())
         stream = io.StringIO(content)
     else:
-        stream = open(source, "r", encoding="utf-8")
-    reader = csv.DictReader(stream, delimiter=sep)
-    rows = [dict(row) for row in reader]
-    df = DataFrame(rows)
-    if not hasattr(source, "read"):
-        stream.close()
-    return df
+        stream = open(source, "r", encoding="utf-8", newline="")
+    try:
+        reader = csv.reader(stream, delimiter=sep)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield header
+        width = len(header)
+        for record in reader:
+            if len(record) > width:
+                raise ValueError(
+                    f"CSV line {reader.line_num} has {len(record)} fields"
+                    f" but the header has {width}"
+                )
+            if record:
+                yield record
+    finally:
+        if not hasattr(source, "read"):
+            stream.close()
+
+
+def read_csv(source, sep: str = ",", chunksize: Optional[int] = None):
+    """Read a delimited file; with ``chunksize``, return an iterator of frames instead."""
+    _check_chunksize(chunksize)
+    records = _iter_csv_records(source, sep)
+    header = next(records, None)
+    if chunksize is not None:
+        if header is None:
+            return iter(())
+        return _iter_chunks(header, records, chunksize, _columns_from_records)
+    if header is None:
+        return DataFrame()
+    return _columns_from_records(header, list(records))
 
 
 def read_parquet(path) -> DataFrame:
     with open(path, "r", encoding="utf-8") as fp:
         data = json.load(fp)
-    columns = data.get("columns", [])
-    rows = [dict(zip(columns, values)) for values in data.get("rows", [])]
-    return DataFrame(rows, columns=columns)
+    return _from_serialized(data)
+
+
+def read_pickle(path) -> DataFrame:
+    # Only for spill files this package wrote itself; never load untrusted pickles.
+    with open(path, "rb") as fp:
+        data = pickle.load(fp)
+    return _from_serialized(data)
+
 
+def to_pickle_chunks(frames: Iterable[DataFrame], path: Path | str) -> None:
+    """Spill ``frames`` to one file, one pickle per frame, holding one frame at a time."""
+    with open(path, "wb") as fp:
+        for frame in frames:
+            pickle.dump(frame._to_serializable(), fp, protocol=5)
 
-def read_excel(path) -> DataFrame:
+
+def read_pickle_chunks(path) -> Iterator[DataFrame]:
+    """Yield the frames of a ``to_pickle_chunks`` file; a ``to_pickle`` file holds one."""
+    # Only for spill files this package wrote itself; never load untrusted pickles.
+    with open(path, "rb") as fp:
+        while True:
+            try:
+                data = pickle.load(fp)
+            except EOFError:
+                return
+            yield _from_serialized(data)
+
+
+_XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def _read_shared_strings(zf: zipfile.ZipFile) -> tuple[str, ...]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return ()
+    shared_strings: List[str] = []
+    with zf.open("xl/sharedStrings.xml") as fh:
+        for _, si in ET.iterparse(fh):
+            if si.tag != _XLSX_NS + "si":
+                continue
+            texts = [node.text or "" for node in si.findall(_XLSX_NS + "t")]
+            shared_strings.append("".join(texts) if texts else "".join(si.itertext()))
+            si.clear()
+    return tuple(shared_strings)
+
+
+def _iter_excel_records(path) -> Iterator[List[str]]:
+    """Yield the cell values of each row of the first worksheet, header row first."""
     if hasattr(path, "read"):
-        data = path.read()
-        stream = io.BytesIO(data)
+        # zipfile reads seekable uploads in place; others are buffered first.
+        stream = path if path.seekable() else io.BytesIO(path.read())
     else:
         stream = open(path, "rb")
-    with zipfile.ZipFile(stream) as zf:
-        shared_strings: List[str] = []
-        if "xl/sharedStrings.xml" in zf.namelist():
-            ss_root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
-            ns = {"a": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
-            for si in ss_root.findall("a:si", ns):
-                texts = [node.text or "" for node in si.findall("a:t", ns)]
-                text = "".join(texts) if texts else "".join(si.itertext())
-                shared_strings.append(text)
-        sheet_root = ET.fromstring(zf.read("xl/worksheets/sheet1.xml"))
-        ns = {"a": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
-        rows = []
-        headers: List[str] = []
-        for idx, row in enumerate(sheet_root.findall(".//a:row", ns)):
-            values: List[str] = []
-            for cell in row.findall("a:c", ns):
-                value = ""
-                v_node = cell.find("a:v", ns)
-                if v_node is not None:
-                    value = v_node.text or ""
-                if cell.get("t") == "s" and value:
-                    value = shared_strings[int(value)]
-                values.append(value)
-            if idx == 0:
-                headers = values
-            else:
-                rows.append(dict(zip(headers, values)))
-    if not hasattr(path, "read"):
-        stream.close()
-    return DataFrame(rows, columns=headers)
+    row_tag, cell_tag, value_tag = _XLSX_NS + "row", _XLSX_NS + "c", _XLSX_NS + "v"
+    try:
+        with zipfile.ZipFile(stream) as zf:
+            shared_strings = _read_shared_strings(zf)
+            # Stream the sheet and drop each row once read, so memory stays flat.
+            sheet_data = None
+            with zf.open("xl/worksheets/sheet1.xml") as fh:
+                for event, elem in ET.iterparse(fh, events=("start", "end")):
+                    if event == "start":
+                        if elem.tag == _XLSX_NS + "sheetData":
+                            sheet_data = elem
+                        continue
+                    if elem.tag != row_tag:
+                        continue
+                    values: List[str] = []
+                    for cell in elem.findall(cell_tag):
+                        v_node = cell.find(value_tag)
+                        value = (v_node.text or "") if v_node is not None else ""
+                        if cell.get("t") == "s" and value:
+                            value = shared_strings[int(value)]
+                        values.append(value)
+                    if sheet_data is not None:
+                        sheet_data.remove(elem)
+                    else:
+                        elem.clear()
+                    yield values
+    finally:
+        if not hasattr(path, "read"):
+            stream.close()
+
+
+def _excel_frame(headers: List[str], records: List[List[str]]) -> DataFrame:
+    # Same cells as dict(zip(headers, values)): a repeated header keeps its last
+    # value present in the row, and cells past a short row stay absent.
+    positions: Dict[str, List[int]] = {}
+    for idx, name in enumerate(headers):
+        positions.setdefault(name, []).insert(0, idx)
+    cols = {
+        name: [
+            next((record[idx] for idx in indexes if idx < len(record)), _MISSING)
+            for record in records
+        ]
+        for name, indexes in positions.items()
+    }
+    return DataFrame._from_columns(cols, len(records))
+
+
+def read_excel(path, chunksize: Optional[int] = None):
+    """Read the first worksheet; with ``chunksize``, return an iterator of frames instead."""
+    _check_chunksize(chunksize)
+    records = _iter_excel_records(path)
+    headers = next(records, None) or []
+    if chunksize is not None:
+        return _iter_chunks(headers, records, chunksize, _excel_frame)
+    return _excel_frame(headers, list(records))
 
 
 def DataFrame_from_records(records: Iterable[Dict[str, Any]]) -> DataFrame:  # pragma: no cover
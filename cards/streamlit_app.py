@@ -14,31 +14,36 @@ from .processing import DataProcessor
 def load_dataframe(uploaded_file) -> pd.DataFrame:
     if uploaded_file is None:
         return pd.DataFrame()
-    content = uploaded_file.read()
-    buffer = io.BytesIO(content)
     if uploaded_file.name.endswith(".xlsx"):
-        return pd.read_excel(buffer)
+        # Parsed straight from the upload, which is already an in-memory file.
+        return pd.read_excel(uploaded_file)
+    # Decoded once and shared by both parse attempts.
+    text = uploaded_file.read().decode("utf-8")
+    if uploaded_file.name.endswith(".tsv"):
+        return pd.read_csv(io.StringIO(text), sep="\t")
     try:
-        return pd.read_csv(io.BytesIO(content))
+        return pd.read_csv(io.StringIO(text))
     except Exception:
-        buffer.seek(0)
-        return pd.read_csv(io.BytesIO(content), sep="\t")
+        return pd.read_csv(io.StringIO(text), sep="\t")
 
 
 def header_wizard(df: pd.DataFrame, list_type: str) -> HeaderMappingResult:
     suggestions = map_headers(df.columns, list_type)
     mapping: Dict[str, str] = {}
+    cols = list(df.columns)
+    idx = {col: i for i, col in enumerate(cols)}
     st.markdown("### Header Mapping")
-    for canonical in suggestions.mapping.keys():
-        default = suggestions.mapping[canonical]
+    for canonical, default in suggestions.mapping.items():
         mapping[canonical] = st.selectbox(
             f"Map {canonical}",
-            options=list(df.columns),
-            index=list(df.columns).index(default) if default in df.columns else 0,
+            options=cols,
+            index=idx.get(default, 0),
             key=f"{list_type}_{canonical}",
         )
     missing = [field for field in suggestions.missing if field not in mapping]
-    return HeaderMappingResult(mapping=mapping, missing=missing, extras=[])
+    chosen = set(mapping.values())
+    extras = [col for col in cols if col not in chosen]
+    return HeaderMappingResult(mapping=mapping, missing=missing, extras=extras)
 
 
 def render():
@@ -100,22 +105,20 @@ def render():
         st.write("Duplicates", report.duplicate_reports)
 
         st.subheader("Combined Master Preview")
+        entries = report.normalized_entries
         combined_df = pd.DataFrame(
-            [
-                {
-                    "Name": entry.name,
-                    "Clinic Name": entry.clinic_name,
-                    "Address": entry.address,
-                    "City": entry.city,
-                    "State": entry.state,
-                    "Zip Code": entry.zip_code,
-                    "Heally Link": entry.heally_link,
-                    "Date and Time": entry.date_time,
-                    "List Source": entry.list_source,
-                    "Duplicate?": entry.normalized_payload.get("duplicate", "No"),
-                }
-                for entry in report.normalized_entries
-            ]
+            {
+                "Name": [entry.name for entry in entries],
+                "Clinic Name": [entry.clinic_name for entry in entries],
+                "Address": [entry.address for entry in entries],
+                "City": [entry.city for entry in entries],
+                "State": [entry.state for entry in entries],
+                "Zip Code": [entry.zip_code for entry in entries],
+                "Heally Link": [entry.heally_link for entry in entries],
+                "Date and Time": [entry.date_time for entry in entries],
+                "List Source": [entry.list_source for entry in entries],
+                "Duplicate?": [entry.normalized_payload.get("duplicate", "No") for entry in entries],
+            }
         )
         st.dataframe(combined_df)
 
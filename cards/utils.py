@@ -2,14 +2,25 @@ from __future__ import annotations
 
 import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from difflib import SequenceMatcher
 from zoneinfo import ZoneInfo
 
-@dataclass
+try:  # pragma: no cover - optional speedup
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional speedup
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover
+    fuzz = process = None  # type: ignore[assignment]
+
+@dataclass(slots=True)
 class NormalizedEntry:
     name: str
     clinic_name: str
@@ -25,6 +36,13 @@ class NormalizedEntry:
     normalized_payload: Dict
     validation_status: str
     uncertainty_reasons: List[str]
+    # Lowercased copies for duplicate matching, derived once per entry.
+    name_lc: str = field(default="", init=False, repr=False, compare=False)
+    address_lc: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.name_lc = self.name.lower()
+        self.address_lc = self.address.lower()
 
 
 NAME_COMMA_RE = re.compile(r"^(?P<last>[^,]+),\s*(?P<first>[^,]+)(?:,?\s*(?P<middle>.+))?$")
@@ -50,10 +68,17 @@ DATETIME_FORMATS = [
 
 
 def normalize_name(name: str) -> Tuple[str, List[str]]:
+    normalized, reasons = _normalize_name_cached(name)
+    return normalized, list(reasons)
+
+
+@lru_cache(maxsize=8192)
+def _normalize_name_cached(name: str) -> Tuple[str, Tuple[str, ...]]:
+    # Names recur within and across the two lists; reasons are a tuple so cached
+    # results cannot be mutated by callers.
     name = name.strip()
-    reasons: List[str] = []
     if not name:
-        return "", ["missing_name"]
+        return "", ("missing_name",)
     match = NAME_COMMA_RE.match(name)
     if match:
         first = match.group("first").title()
@@ -63,11 +88,9 @@ def normalize_name(name: str) -> Tuple[str, List[str]]:
         if middle:
             parts.append(" ".join(token.title() for token in middle.split()))
         parts.append(last)
-        normalized = " ".join(parts)
-        reasons.append("name_flipped")
-        return normalized, reasons
+        return " ".join(parts), ("name_flipped",)
     parts = [token.title() for token in name.split()]
-    return " ".join(parts), reasons
+    return " ".join(parts), ()
 
 
 def extract_heally(link: Optional[str], raw: Dict) -> Tuple[str, Optional[str], List[str]]:
@@ -77,36 +100,79 @@ def extract_heally(link: Optional[str], raw: Dict) -> Tuple[str, Optional[str],
         match = HEALLY_ID_RE.search(link)
         heally_id = match.group(1) if match else None
         return link, heally_id, reasons
-    # search in raw values
-    search_space = " ".join(str(value) for value in raw.values() if isinstance(value, str))
-    match = HEALLY_ID_RE.search(search_space)
-    if match:
-        heally_id = match.group(1)
-        link = f"https://getheally.com/super_admin/patient_users/{heally_id}"
-        reasons.append("constructed_heally_link")
-        return link, heally_id, reasons
+    # search in raw values; the first value holding an ID wins
+    for value in raw.values():
+        if not value or not isinstance(value, str):
+            continue
+        match = HEALLY_ID_RE.search(value)
+        if match:
+            heally_id = match.group(1)
+            link = f"https://getheally.com/super_admin/patient_users/{heally_id}"
+            reasons.append("constructed_heally_link")
+            return link, heally_id, reasons
     return "N/A", None, ["missing_heally_link"]
 
 
+@lru_cache(maxsize=32)
+def _zi(tz: str) -> ZoneInfo:
+    return ZoneInfo(tz)
+
+
 def parse_datetime(value: Optional[str], timezone: str) -> Tuple[Optional[datetime], List[str]]:
+    parsed, reasons, _ = _parse_datetime(value, timezone, DATETIME_FORMATS)
+    return parsed, reasons
+
+
+def _parse_datetime(
+    value: Optional[str],
+    timezone: str,
+    formats: Sequence[str],
+) -> Tuple[Optional[datetime], List[str], Optional[str]]:
+    # parse_datetime trying ``formats`` in order; also returns the format that matched.
     if not value:
-        return None, ["missing_datetime"]
+        return None, ["missing_datetime"], None
     parsed = None
-    for fmt in DATETIME_FORMATS:
+    matched = None
+    for fmt in formats:
         try:
             parsed = datetime.strptime(value.strip(), fmt)
+            matched = fmt
             break
         except (ValueError, TypeError, AttributeError):
             continue
     if parsed is None:
-        return None, ["invalid_datetime"]
+        return None, ["invalid_datetime"], None
+    # Values are wall-clock times in the configured zone. astimezone() into the
+    # value's own ZoneInfo returns it without adjustment, even for times in a
+    # DST gap or fold, so the old localize-and-convert step never changed the
+    # result; only the zone name needs checking.
     try:
-        tz = ZoneInfo(timezone)
-        parsed = parsed.replace(tzinfo=tz)
-        parsed = parsed.astimezone(tz)
-        return parsed.replace(tzinfo=None), []
+        _zi(timezone)
+        return parsed, [], matched
     except Exception:
-        return parsed, ["timezone_error"]
+        return parsed, ["timezone_error"], matched
+
+
+def parse_datetimes_batch(
+    values: Iterable[Optional[str]],
+    timezone: str,
+) -> List[Tuple[Optional[datetime], List[str]]]:
+    """Parse many values at once, running ``parse_datetime`` once per distinct value.
+
+    A file almost always uses one layout, so the format that matched the previous
+    value is tried first. No value can match two of the formats, so the order only
+    changes how many are tried.
+    """
+    values = list(values)
+    formats: Sequence[str] = DATETIME_FORMATS
+    parsed: Dict[Optional[str], Tuple[Optional[datetime], List[str]]] = {}
+    for value in dict.fromkeys(values):
+        date_time, reasons, matched = _parse_datetime(value, timezone, formats)
+        parsed[value] = (date_time, reasons)
+        if matched is not None and matched != formats[0]:
+            formats = (matched, *(fmt for fmt in DATETIME_FORMATS if fmt != matched))
+    # Repeated values share one parse, but every row gets its own reasons list.
+    return [(date_time, list(reasons)) for date_time, reasons in map(parsed.__getitem__, values)]
 
 
 def format_datetime(dt: Optional[datetime]) -> str:
@@ -117,26 +183,154 @@ def format_datetime(dt: Optional[datetime]) -> str:
 
 def normalized_key(entry: NormalizedEntry) -> Tuple[str, str, str, str, str]:
     return (
-        entry.name.lower(),
-        entry.address.lower(),
+        entry.name_lc,
+        entry.address_lc,
         entry.city.lower(),
         entry.state.lower(),
         entry.zip_code,
     )
 
 
-def _ratio(left: str, right: str) -> float:
-    if not left and not right:
+def _ratio_lc(left: str, right: str) -> float:
+    # Expects already lowercased strings. Covers two empty strings too, and skips
+    # SequenceMatcher for exact repeats. difflib stays the reference scorer with or
+    # without rapidfuzz, so whether a pair matches never depends on what is installed.
+    if left == right:
         return 1.0
-    return SequenceMatcher(None, left.lower(), right.lower()).ratio()
+    return SequenceMatcher(None, left, right).ratio()
 
 
-def fuzzy_match_score(a: NormalizedEntry, b: NormalizedEntry) -> float:
-    name_score = _ratio(a.name, b.name)
-    address_score = _ratio(a.address, b.address)
+def fuzzy_match_score(
+    a: NormalizedEntry,
+    b: NormalizedEntry,
+    threshold: Optional[float] = None,
+) -> float:
+    """Average name and address similarity of two entries.
+
+    With ``threshold``, pairs whose lengths alone keep them below it score 0.0
+    without any string matching; see ``fuzzy_score_upper_bound``.
+    """
+    if threshold is not None and fuzzy_score_upper_bound(a, b) < threshold:
+        return 0.0
+    return _fuzzy_score(a.name_lc, a.address_lc, b.name_lc, b.address_lc)
+
+
+@lru_cache(maxsize=4096)
+def _fuzzy_score(a_name: str, a_address: str, b_name: str, b_address: str) -> float:
+    # Keyed on the compared fields only; pairs recur across dedupe passes and batches.
+    if a_name == b_name and a_address == b_address:
+        return 1.0
+    name_score = _ratio_lc(a_name, b_name)
+    address_score = _ratio_lc(a_address, b_address)
     return (name_score + address_score) / 2
 
 
+def json_dumps(
+    value: Any,
+    *,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """Encode ``value`` as JSON text, using orjson when it is installed.
+
+    Both paths decode to the same value: datetimes go through ``default`` and
+    non-string keys are coerced as ``json.dumps`` does. orjson's output is compact,
+    so callers must not depend on the whitespace.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=default, option=option).decode("utf-8")
+    return json.dumps(value, indent=2 if indent else None, default=default)
+
+
+def json_loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _length_bound(left: int, right: int) -> float:
+    total = left + right
+    return 2 * min(left, right) / total if total else 1.0
+
+
+def fuzzy_score_upper_bound(a: NormalizedEntry, b: NormalizedEntry) -> float:
+    """Upper bound on fuzzy_match_score computed from string lengths alone.
+
+    A ratio of 2*M/(len_a + len_b) can never exceed 2*min(len_a, len_b)/(len_a + len_b),
+    so pairs whose bound falls below the threshold can be skipped without scoring.
+    """
+    name_bound = _length_bound(len(a.name), len(b.name))
+    address_bound = _length_bound(len(a.address), len(b.address))
+    return (name_bound + address_bound) / 2
+
+
+def block_key(entry: NormalizedEntry) -> Tuple[str, str]:
+    """Blocking key for fuzzy duplicate candidates: state and ZIP3 prefix."""
+    return entry.state.upper(), entry.zip_code[:3]
+
+
+def block_entries(
+    entries: Iterable[NormalizedEntry],
+) -> Dict[Tuple[str, str], List[NormalizedEntry]]:
+    """Group entries by ``block_key``, keeping their order within each block."""
+    blocks: Dict[Tuple[str, str], List[NormalizedEntry]] = {}
+    for entry in entries:
+        blocks.setdefault(block_key(entry), []).append(entry)
+    return blocks
+
+
+def _quick_name_screen(name: str, names: Sequence[str], cutoff: float) -> Iterator[int]:
+    # One matcher keeps the entry's name as seq2, so its character counts are built
+    # once; quick_ratio() bounds the real ratio from above in either argument order.
+    matcher = SequenceMatcher(None)
+    matcher.set_seq2(name)
+    for index, other in enumerate(names):
+        matcher.set_seq1(other)
+        if matcher.quick_ratio() >= cutoff:
+            yield index
+
+
+def first_fuzzy_match(
+    entry: NormalizedEntry,
+    candidates: Sequence[NormalizedEntry],
+    threshold: float,
+    names: Optional[Sequence[str]] = None,
+) -> Optional[Tuple[int, float]]:
+    """Return the index and score of the first candidate scoring at least ``threshold``.
+
+    The score averages two ratios of at most 1, so a match needs a name ratio of
+    at least ``2 * threshold - 1``. With rapidfuzz the names are screened against
+    that cutoff in a single batch call, otherwise with difflib's quick_ratio bound,
+    and only the survivors are fully scored. Both screens bound difflib's ratio
+    from above: rapidfuzz's ratio is computed over the longest common subsequence,
+    which is never shorter than the blocks SequenceMatcher matches. ``names`` may
+    pass the candidates' ``name_lc`` values when they are reused.
+    """
+    if names is None:
+        names = [candidate.name_lc for candidate in candidates]
+    if process is not None:
+        cutoff = max(0.0, (2 * threshold - 1) * 100 - 1e-6)
+        hits = process.extract(
+            entry.name_lc,
+            names,
+            scorer=fuzz.ratio,
+            processor=None,
+            score_cutoff=cutoff,
+            limit=None,
+        )
+        indexes: Iterable[int] = sorted(hit[2] for hit in hits)
+    else:
+        indexes = _quick_name_screen(entry.name_lc, names, 2 * threshold - 1 - 1e-9)
+    for index in indexes:
+        score = fuzzy_match_score(entry, candidates[index], threshold)
+        if score >= threshold:
+            return index, score
+    return None
+
+
 def serialize_entry(entry: NormalizedEntry) -> Dict:
     payload = {
         "Name": entry.name,
@@ -158,8 +352,15 @@ __all__ = [
     "normalize_name",
     "extract_heally",
     "parse_datetime",
+    "parse_datetimes_batch",
     "format_datetime",
     "normalized_key",
     "fuzzy_match_score",
+    "fuzzy_score_upper_bound",
+    "block_key",
+    "block_entries",
+    "first_fuzzy_match",
     "serialize_entry",
+    "json_dumps",
+    "json_loads",
 ]
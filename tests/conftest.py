@@ -9,7 +9,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from cards import init_db
-from cards.config import get_settings
+from cards.config import reset_settings
 from cards import db as db_module
 
 
@@ -19,14 +19,8 @@ def configure_env(tmp_path, monkeypatch):
     export_path = tmp_path / "exports"
     monkeypatch.setenv("CARDS_DB_URL", f"sqlite:///{db_path}")
     monkeypatch.setenv("CARDS_EXPORT_DIR", str(export_path))
-    try:
-        get_settings.cache_clear()
-    except AttributeError:
-        pass
+    reset_settings()
     init_db()
     yield
-    try:
-        get_settings.cache_clear()
-    except AttributeError:
-        pass
-    db_module._connection_cache.clear()
+    reset_settings()
+    db_module.close_connections()
@@ -1,4 +1,11 @@
-from cards.address import normalize_address, normalize_state, normalize_zip, validate_and_normalize_address
+from cards.address import (
+    infer_city_state_from_zip,
+    normalize_address,
+    normalize_state,
+    normalize_zip,
+    validate_and_normalize_address,
+    validate_and_normalize_addresses,
+)
 
 
 def test_address_abbreviation_expansion():
@@ -26,3 +33,32 @@ def test_infer_city_state_from_zip_missing_city():
     assert result.city == "Lomita"
     assert result.state == "CA"
     assert "inferred_city_state_from_zip" in result.reasons
+
+
+def test_infer_city_state_from_zip_rejects_non_digit_zips():
+    assert infer_city_state_from_zip("90717") == ("Lomita", "CA")
+    for zip5 in ("+9071", " 9071", "9_071", "\uff19\uff10\uff17\uff11\uff17", "-9071"):
+        assert infer_city_state_from_zip(zip5) is None
+
+
+def test_zip_parsing_plain_and_invalid():
+    assert normalize_zip(" 90001 ") == ("90001", None, tuple())
+    assert normalize_zip("9000a") == (None, None, ("invalid_zip",))
+    assert normalize_zip("") == (None, None, ("missing_zip",))
+
+
+def test_validation_results_are_reused_for_repeated_addresses():
+    first = validate_and_normalize_address("123 main st", "los angeles", "ca", "90001")
+    second = validate_and_normalize_address("123 main st", "los angeles", "ca", "90001")
+    assert first is second
+
+
+def test_batch_validation_matches_single_calls():
+    records = [
+        ("123 main st", "los angeles", "ca", "90001"),
+        ("1711 245th st", "", "", "90717"),
+        ("123 main st", "los angeles", "ca", "90001"),
+    ]
+    results = validate_and_normalize_addresses(records)
+    assert results == [validate_and_normalize_address(*record) for record in records]
+    assert results[0] is results[2]
@@ -0,0 +1,53 @@
+from cards import api
+from cards import simple_pandas as pd
+from cards.processing import DataProcessor
+from cards.header_mapping import HeaderMappingResult
+
+
+MAPPING = {
+    "name": "name",
+    "clinic_name": "clinic",
+    "address": "address",
+    "city": "city",
+    "state": "state",
+    "zip": "zip",
+    "date_time": "datetime",
+    "heally_link": "heally",
+}
+
+ROW = {
+    "name": "John Doe",
+    "clinic": "HappyMD",
+    "address": "28 Davison Hill Ln",
+    "city": "Oroville",
+    "state": "CA",
+    "zip": "95966",
+    "datetime": "2025-02-20 11:13",
+    "heally": "",
+}
+
+
+def post_process(rows):
+    payload = api.UploadPayload(
+        new_visits=rows,
+        reprints=[],
+        new_visit_mapping=MAPPING,
+        reprint_mapping=MAPPING,
+    )
+    return api.process(payload)
+
+
+def test_process_sees_batches_committed_by_other_writers(monkeypatch):
+    monkeypatch.setattr(api, "_processor", None)
+    other = {**ROW, "name": "Mary Major", "address": "5 Oak Ave"}
+    assert post_process([other])["duplicates"] == []
+
+    # Another writer (the CLI or the UI) commits a batch after the API has loaded history.
+    mapping = HeaderMappingResult(mapping=MAPPING, missing=[], extras=[])
+    DataProcessor().process(pd.DataFrame([ROW]), pd.DataFrame([]), mapping, mapping)
+
+    result = post_process([ROW])
+    assert [d["rule"] for d in result["duplicates"]] == ["exact_key"]
+    # The API's own earlier batch is remembered once, not read back a second time.
+    rules = [d["rule"] for d in post_process([other])["duplicates"]]
+    assert rules == ["exact_key"]
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+
+import pytest
+
+from cards.db import get_connection, iter_rows
+
+
+def test_init_db_creates_lookup_indexes():
+    conn = get_connection()
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    indexes = {row["name"] for row in rows}
+    expected = {"ix_entries_batch_id", "ix_dup_entry", "ix_dup_matched", "ix_batches_created"}
+    assert expected <= indexes
+
+
+def test_export_query_uses_batch_index():
+    conn = get_connection()
+    plan = " ".join(
+        row["detail"]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM entries WHERE batch_id = ?", (1,)
+        )
+    )
+    assert "SEARCH entries USING" in plan and "(batch_id=?)" in plan
+
+
+def test_connections_are_per_thread():
+    main_conn = get_connection()
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(get_connection()))
+    worker.start()
+    worker.join()
+    assert seen and seen[0] is not main_conn
+    assert get_connection() is main_conn
+
+
+def test_history_clinic_filter_is_answered_from_index():
+    conn = get_connection()
+    plan = " ".join(
+        row["detail"]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(e.id) FROM batches b"
+            " LEFT JOIN entries e ON e.batch_id = b.id"
+            " AND e.clinic_name = ? GROUP BY b.id",
+            ("Happymd",),
+        )
+    )
+    assert "ix_entries_batch_clinic" in plan
+
+
+def test_iter_rows_reads_in_chunks():
+    conn = get_connection()
+    conn.executemany("INSERT INTO batches (label) VALUES (?)", [(f"b{i}",) for i in range(5)])
+    cursor = conn.execute("SELECT label FROM batches ORDER BY id")
+    assert [row["label"] for row in iter_rows(cursor, size=2)] == [f"b{i}" for i in range(5)]
+
+
+def test_init_db_backfills_scalar_entry_columns(tmp_path, monkeypatch):
+    import sqlite3
+
+    from cards.config import reset_settings
+    from cards.db import close_connections, init_db
+
+    db_path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(db_path)
+    legacy.execute(
+        "CREATE TABLE entries (id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id INTEGER NOT NULL,"
+        " list_source TEXT NOT NULL, date_time_local TEXT, raw_payload_json TEXT NOT NULL,"
+        " normalized_payload_json TEXT NOT NULL, validation_status TEXT NOT NULL,"
+        " uncertainty_reasons TEXT NOT NULL)"
+    )
+    legacy.execute(
+        "INSERT INTO entries (batch_id, list_source, raw_payload_json, normalized_payload_json,"
+        " validation_status, uncertainty_reasons) VALUES (1, 'Reprint', '{}', ?, 'ok', '[]')",
+        ('{"name": "John Doe", "clinic_name": "Happymd", "zip": "95966", "duplicate": "No"}',),
+    )
+    legacy.commit()
+    legacy.close()
+
+    close_connections()
+    monkeypatch.setenv("CARDS_DB_URL", f"sqlite:///{db_path}")
+    reset_settings()
+    init_db()
+    row = get_connection().execute(
+        "SELECT name, clinic_name, zip, zip4, duplicate FROM entries"
+    ).fetchone()
+    assert tuple(row) == ("John Doe", "Happymd", "95966", None, "No")
+
+
+def test_connection_pragmas():
+    conn = get_connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+
+
+def test_foreign_keys_are_enforced():
+    conn = get_connection()
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO print_jobs (batch_id) VALUES (?)", (999,))
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "INSERT INTO duplicate_matches (entry_id, matched_entry_id, rule) VALUES (?, ?, ?)",
+            (999, None, "exact_key"),
+        )
+    conn.rollback()
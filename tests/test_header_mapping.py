@@ -1,4 +1,7 @@
-from cards.header_mapping import HeaderMapper, map_headers
+import pytest
+
+from cards import header_mapping
+from cards.header_mapping import CANONICAL_HEADERS, HeaderMapper, map_headers
 
 
 def test_header_mapping_auto_detection():
@@ -25,3 +28,35 @@ def test_header_mapper_missing_required():
     result = map_headers(headers, "reprint")
     assert "clinic_name" in result.missing
     assert "date_time" in result.missing
+
+
+HEADER_SETS = [
+    ["Patient Name", "Clinic", "Street Addr", "City", "State Name", "Zip Code", "Appointment Time"],
+    ["patient_nme", "clinc_name", "adress", "citty", "stat", "zipcod", "date_tme", "heally_lnk"],
+    ["Full Name", "Clinic Nam", "Street Adress", "Town", "Province", "Postal Cde", "Timestamp"],
+    [variant for variants in CANONICAL_HEADERS.values() for variant in variants],
+    [variant[:-1] for variants in CANONICAL_HEADERS.values() for variant in variants],
+    [variant + "s" for variants in CANONICAL_HEADERS.values() for variant in variants],
+    # Equally close candidates: difflib prefers the later string, not the first header.
+    ["name", "dae_time", "date_tme", "ostate", "statoe"],
+]
+
+
+def map_all(monkeypatch, use_rapidfuzz):
+    if not use_rapidfuzz:
+        monkeypatch.setattr(header_mapping, "process", None)
+    header_mapping._closest_headers.cache_clear()
+    try:
+        return [map_headers(headers, "new_visit").mapping for headers in HEADER_SETS]
+    finally:
+        header_mapping._closest_headers.cache_clear()
+
+
+def test_closest_headers_agree_with_and_without_rapidfuzz(monkeypatch):
+    if header_mapping.process is None:
+        pytest.skip("rapidfuzz is not installed")
+    with_rapidfuzz = map_all(monkeypatch, True)
+    assert with_rapidfuzz == map_all(monkeypatch, False)
+    assert with_rapidfuzz[1]["address"] == "adress"
+    assert with_rapidfuzz[-1]["date_time"] == "date_tme"
+    assert with_rapidfuzz[-1]["state"] == "statoe"
@@ -122,3 +122,91 @@ def test_heally_link_construction():
     entry = report.normalized_entries[0]
     assert entry.heally_link.endswith("1234567")
     assert "constructed_heally_link" in entry.uncertainty_reasons
+
+
+def test_duplicates_against_history():
+    row = {
+        "name": "John Doe",
+        "clinic": "HappyMD",
+        "address": "28 Davison Hill Ln",
+        "city": "Oroville",
+        "state": "CA",
+        "zip": "95966",
+        "datetime": "2025-02-20 11:13",
+        "heally": "",
+    }
+    first = DataProcessor()
+    df = build_dataframe([row])
+    first.process(df, build_dataframe([]), get_mappings(df), get_mappings(df))
+
+    processor = DataProcessor()
+    near = dict(row, name="Jon Doe")
+    elsewhere = dict(row, name="Jon Doe", zip="10001", city="New York", state="NY")
+    report = processor.process(
+        build_dataframe([row, near]),
+        build_dataframe([elsewhere]),
+        get_mappings(df),
+        get_mappings(df),
+    )
+    rules = {(d["entry_name"], d["rule"]) for d in report.duplicate_reports}
+    assert ("John Doe", "exact_key") in rules
+    assert ("Jon Doe", "fuzzy") in rules
+    assert sum(1 for d in report.duplicate_reports if d["rule"] == "fuzzy") == 1
+
+
+def test_normalize_rows_in_pool_matches_serial(monkeypatch):
+    from cards import processing
+
+    rows = [
+        {
+            "name": f"Patient {idx}",
+            "clinic": "HappyMD",
+            "address": f"{idx} Main St",
+            "city": "Oroville",
+            "state": "CA",
+            "zip": "95966",
+            "datetime": "2025-02-20 11:13",
+            "heally": "",
+        }
+        for idx in range(7)
+    ]
+    df = build_dataframe(rows)
+    processor = DataProcessor()
+    serial, _ = processor.normalize_rows(df, "new_visit", get_mappings(df))
+
+    monkeypatch.setattr(processing, "PARALLEL_MIN_ROWS", 2)
+    pooled = DataProcessor(workers=3)
+    parallel, _ = pooled.normalize_rows(df, "new_visit", get_mappings(df))
+    assert pooled._pool is None
+    assert [entry.name for entry in parallel] == [entry.name for entry in serial]
+    assert [entry.normalized_payload for entry in parallel] == [
+        entry.normalized_payload for entry in serial
+    ]
+
+
+def test_normalize_rows_accepts_chunked_input(tmp_path):
+    path = tmp_path / "visits.csv"
+    path.write_text(
+        "name,clinic,address,city,state,zip,datetime,heally\n"
+        + "".join(
+            f"Patient {idx},HappyMD,{idx} Main St,Oroville,CA,95966,2025-02-20 11:13,\n"
+            for idx in range(5)
+        )
+    )
+    processor = DataProcessor()
+    df = processor.read_input(path)
+    whole, _ = processor.normalize_rows(df, "new_visit", get_mappings(df))
+    chunked, _ = processor.normalize_rows(
+        processor.read_input_chunks(path, chunksize=2), "new_visit", get_mappings(df)
+    )
+    assert [entry.normalized_payload for entry in chunked] == [
+        entry.normalized_payload for entry in whole
+    ]
+
+    spill = tmp_path / "pending.pkl"
+    pd.to_pickle_chunks(processor.read_input_chunks(path, chunksize=2), spill)
+    report = processor.process(
+        pd.read_pickle_chunks(spill), build_dataframe([]), get_mappings(df), get_mappings(df)
+    )
+    assert report.summary["new_visits"] == 5
+    assert [entry.name for entry in report.normalized_entries] == [entry.name for entry in whole]
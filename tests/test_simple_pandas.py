@@ -0,0 +1,79 @@
+import io
+
+import pytest
+
+from cards import simple_pandas as pd
+
+
+def test_read_csv_matches_dict_reader_semantics():
+    data = "name,city,name\nAda,Austin,Ada B\n\n"
+    df = pd.read_csv(io.StringIO(data))
+    assert df.columns == ["name", "city"]
+    assert [row.to_dict() for _, row in df.iterrows()] == [{"name": "Ada B", "city": "Austin"}]
+
+    short = pd.read_csv(io.StringIO("name,city\nBob\nCy,Dallas\n"))
+    assert short.to_records() == [{"name": "Bob", "city": None}, {"name": "Cy", "city": "Dallas"}]
+
+
+def test_read_csv_rejects_rows_longer_than_the_header():
+    data = "name,city\nBob\nCy,Dallas\n\nDee,Austin,extra\n"
+    with pytest.raises(ValueError, match="CSV line 5 has 3 fields but the header has 2"):
+        pd.read_csv(io.StringIO(data))
+    chunks = pd.read_csv(io.StringIO(data), chunksize=1)
+    assert next(chunks).to_records() == [{"name": "Bob", "city": None}]
+    with pytest.raises(ValueError, match="CSV line 5"):
+        list(chunks)
+
+
+def test_heterogeneous_rows_round_trip(tmp_path):
+    df = pd.DataFrame([{"a": 1}, {"b": 2}])
+    assert df.columns == ["a", "b"]
+    assert df.to_records() == [{"a": 1}, {"b": 2}]
+    assert df["a"] == [1, None]
+    path = tmp_path / "frame.csv"
+    df.to_csv(path)
+    assert path.read_text().splitlines() == ["a,b", "1,", ",2"]
+    assert df.iloc[1:].to_records() == [{"b": 2}]
+
+
+def test_read_excel_streams_rows_with_shared_strings():
+    import zipfile
+
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr(
+            "xl/sharedStrings.xml",
+            f"<sst {ns}><si><t>name</t></si><si><r><t>ci</t></r><r><t>ty</t></r></si></sst>",
+        )
+        zf.writestr(
+            "xl/worksheets/sheet1.xml",
+            f"<worksheet {ns}><sheetData>"
+            '<row><c t="s"><v>0</v></c><c t="s"><v>1</v></c></row>'
+            "<row><c><v>Ada</v></c><c><v>Austin</v></c></row>"
+            "<row><c><v>Bob</v></c></row>"
+            "</sheetData></worksheet>",
+        )
+    buf.seek(0)
+    df = pd.read_excel(buf)
+    assert df.columns == ["name", "city"]
+    assert df.to_records() == [{"name": "Ada", "city": "Austin"}, {"name": "Bob"}]
+
+
+def test_read_csv_in_chunks():
+    data = "name,city\n" + "".join(f"p{idx},c{idx}\n" for idx in range(5))
+    chunks = list(pd.read_csv(io.StringIO(data), chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[2].to_records() == [{"name": "p4", "city": "c4"}]
+    assert list(pd.read_csv(io.StringIO(""), chunksize=2)) == []
+
+
+def test_pickle_chunks_round_trip(tmp_path):
+    path = tmp_path / "spill.pkl"
+    frames = [pd.DataFrame([{"name": "Ada"}, {"name": "Bob"}]), pd.DataFrame([{"name": "Cy"}])]
+    pd.to_pickle_chunks(iter(frames), path)
+    chunks = list(pd.read_pickle_chunks(path))
+    assert [chunk.to_records() for chunk in chunks] == [frame.to_records() for frame in frames]
+
+    frames[0].to_pickle(path)
+    assert [chunk.to_records() for chunk in pd.read_pickle_chunks(path)] == [frames[0].to_records()]
@@ -0,0 +1,184 @@
+import random
+from datetime import datetime
+from difflib import SequenceMatcher
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from cards import utils
+from cards.utils import (
+    DATETIME_FORMATS,
+    NormalizedEntry,
+    first_fuzzy_match,
+    fuzzy_match_score,
+    json_dumps,
+    json_loads,
+    normalize_name,
+    parse_datetime,
+    parse_datetimes_batch,
+)
+
+
+def make_entry(name, address):
+    return NormalizedEntry(
+        name=name,
+        clinic_name="HappyMD",
+        address=address,
+        city="Oroville",
+        state="CA",
+        zip_code="95966",
+        heally_link="N/A",
+        heally_id=None,
+        date_time=None,
+        list_source="New Visit",
+        raw={},
+        normalized_payload={},
+        validation_status="ok",
+        uncertainty_reasons=[],
+    )
+
+
+def test_normalize_name_returns_fresh_reason_lists():
+    name, reasons = normalize_name("Smith, John")
+    assert (name, reasons) == ("John Smith", ["name_flipped"])
+    reasons.append("mutated")
+    assert normalize_name("Smith, John") == ("John Smith", ["name_flipped"])
+    first = normalize_name("Jane Roe")[1]
+    first.append("mutated")
+    second = normalize_name("Jane Roe")[1]
+    assert second == [] and second is not first
+
+
+def test_fuzzy_scores_use_difflib_ratios():
+    # rapidfuzz's LCS ratio puts this pair at 0.939, above the default 0.92 threshold;
+    # difflib, the reference, scores it below.
+    entry = make_entry("John Doe", "28 Davison Hill Lane")
+    other = make_entry("John Doe", "28 Danvison Hlil Alne")
+    assert round(fuzzy_match_score(entry, other), 4) == 0.9146
+    assert first_fuzzy_match(entry, [other], 0.92) is None
+    assert first_fuzzy_match(entry, [other], 0.91) == (0, fuzzy_match_score(entry, other))
+
+
+def test_ratio_matches_sequence_matcher():
+    assert utils._ratio_lc("", "") == 1.0
+    assert utils._ratio_lc("", "john doe") == 0.0
+    assert utils._ratio_lc("john doe", "john doe") == 1.0
+    for left, right in [("john doe", "jon doe"), ("cdcbaeebeaab", " aebaa"), ("a", "b")]:
+        assert utils._ratio_lc(left, right) == SequenceMatcher(None, left, right).ratio()
+
+
+def brute_force_match(entry, candidates, threshold):
+    for index, candidate in enumerate(candidates):
+        score = fuzzy_match_score(entry, candidate)
+        if score >= threshold:
+            return index, score
+    return None
+
+
+@pytest.mark.parametrize("use_rapidfuzz", [True, False])
+def test_first_fuzzy_match_matches_brute_force(monkeypatch, use_rapidfuzz):
+    if not use_rapidfuzz:
+        monkeypatch.setattr(utils, "process", None)
+    elif utils.process is None:
+        pytest.skip("rapidfuzz is not installed")
+    rng = random.Random(7)
+    names = ["John Doe", "Jon Doe", "John Do", "Jane Roe", "Joan Doe", "Bob Smith", ""]
+    addresses = ["28 Davison Hill Ln", "28 Davison Hill Lane", "28 Davison Hl Ln", "5 Oak Ave"]
+    for _ in range(200):
+        entry = make_entry(rng.choice(names), rng.choice(addresses))
+        candidates = [
+            make_entry(rng.choice(names), rng.choice(addresses)) for _ in range(rng.randint(0, 8))
+        ]
+        for threshold in (0.5, 0.8, 0.92):
+            expected = brute_force_match(entry, candidates, threshold)
+            assert first_fuzzy_match(entry, candidates, threshold) == expected
+
+
+MIXED_DATETIMES = [
+    "2025-02-20 11:13:05",
+    "2025-02-20 11:13",
+    "2025-02-20",
+    "02/20/2025 11:13:05",
+    "02/20/2025 11:13",
+    "02/20/2025",
+    "2025/02/20 11:13:05",
+    "2025/02/20 11:13",
+    "2025/02/20",
+    "02-20-2025 11:13:05",
+    "02-20-2025 11:13",
+    "02-20-2025",
+    "2/3/2025 9:05",
+    "20/02/2025",
+    "",
+    None,
+]
+
+
+def test_each_datetime_matches_at_most_one_format():
+    for value in MIXED_DATETIMES:
+        matches = []
+        for fmt in DATETIME_FORMATS:
+            try:
+                datetime.strptime(value or "", fmt)
+            except ValueError:
+                continue
+            matches.append(fmt)
+        assert len(matches) <= 1, (value, matches)
+
+
+def test_parse_datetimes_batch_is_order_independent():
+    timezone = "America/Los_Angeles"
+    expected = [parse_datetime(value, timezone) for value in MIXED_DATETIMES]
+    assert parse_datetimes_batch(MIXED_DATETIMES, timezone) == expected
+    reversed_values = MIXED_DATETIMES[::-1]
+    assert parse_datetimes_batch(reversed_values, timezone) == expected[::-1]
+    assert expected[0] == (datetime(2025, 2, 20, 11, 13, 5), [])
+    assert expected[13] == (None, ["invalid_datetime"])
+    assert parse_datetime("2025-02-20", "Not/AZone")[1] == ["timezone_error"]
+
+
+def test_parse_datetimes_batch_returns_separate_reason_lists():
+    results = parse_datetimes_batch(["bad", "bad", None, None], "America/Los_Angeles")
+    results[0][1].append("extra")
+    results[2][1].clear()
+    assert results[1] == (None, ["invalid_datetime"])
+    assert results[3] == (None, ["missing_datetime"])
+
+
+def test_parse_datetime_keeps_dst_gap_and_fold_wall_times():
+    timezone = "America/New_York"
+    zone = ZoneInfo(timezone)
+    # 02:30 does not exist on 2024-03-10 and 01:30 occurs twice on 2024-11-03.
+    for value, wall in (
+        ("2024-03-10 02:30", datetime(2024, 3, 10, 2, 30)),
+        ("2024-11-03 01:30", datetime(2024, 11, 3, 1, 30)),
+    ):
+        round_trip = wall.replace(tzinfo=zone).astimezone(zone).replace(tzinfo=None)
+        assert round_trip == wall
+        assert parse_datetime(value, timezone) == (wall, [])
+        assert parse_datetimes_batch([value], timezone) == [(wall, [])]
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(utils, "orjson", None)
+    elif utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_json_dumps_encodes_datetimes_through_default(json_backend):
+    value = {"when": datetime(2025, 2, 20, 11, 13), "dates": [datetime(2025, 1, 1)]}
+    encoded = json_dumps(value, default=str)
+    assert isinstance(encoded, str)
+    assert json_loads(encoded) == {"when": "2025-02-20 11:13:00", "dates": ["2025-01-01 00:00:00"]}
+    with pytest.raises(TypeError):
+        json_dumps(value)
+
+
+def test_json_dumps_coerces_non_string_keys_like_stdlib(json_backend):
+    value = {1: "one", 2.5: "half", None: "none", "nested": {False: [1, 2]}}
+    decoded = json_loads(json_dumps(value, indent=True))
+    assert decoded == {"1": "one", "2.5": "half", "null": "none", "nested": {"false": [1, 2]}}
+    assert json_loads(json_dumps(value).encode("utf-8")) == decoded